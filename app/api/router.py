@@ -1,5 +1,6 @@
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+import asyncio
 import time
 
 
@@ -14,9 +15,9 @@ health_router = APIRouter()
 async def get_health_status():
     try:
         app_logger.info("Health check endpoint called")
-        result = HealthCheck.check_all()
-        app_logger.info(f"Health check completed with status: {result.get('status', 'unknown')}")
-        return JSONResponse(content=result)
+        loop = asyncio.get_running_loop()
+        content = await loop.run_in_executor(None, HealthCheck.check_all_json)
+        return Response(content=content, media_type="application/json")
     except Exception as e:
         app_logger.error(f"Error in health endpoint: {e}")
         return JSONResponse(
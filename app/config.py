@@ -4,53 +4,120 @@ Simple, dependency-free configuration using environment variables.
 """
 
 import os
+import re
+import sys
+from functools import lru_cache
 from typing import Optional
 
 
+_DEFAULT_SECRET_KEY = "your-secret-key-change-in-production"
+_CORS_SPLIT = re.compile(r"\s*,\s*")
+_TRUE = frozenset({"true", "1", "yes", "on"})
+
+
+def _to_bool(value: str) -> bool:
+    """Parse a boolean flag from an environment variable value."""
+    return value.lower() in _TRUE
+
+
+# (attribute, environment variable, caster, default) for every plain field.
+# A caster of None keeps the raw value, so unset optional variables stay None.
+_FIELDS = (
+    # Server Configuration
+    ("host", "HOST", str, "0.0.0.0"),
+    ("port", "PORT", int, "8000"),
+    ("debug", "DEBUG", _to_bool, "false"),
+    ("reload", "RELOAD", _to_bool, "false"),
+    
+    # Application Configuration
+    ("app_name", "APP_NAME", str, "Pakistani Bank Fraud Detection System"),
+    ("app_version", "APP_VERSION", str, "1.0.0"),
+    ("environment", "ENVIRONMENT", str, "development"),
+    ("nicegui_mount_path", "NICEGUI_MOUNT_PATH", str, "/"),
+    
+    # Security Configuration
+    ("secret_key", "SECRET_KEY", str, _DEFAULT_SECRET_KEY),
+    ("algorithm", "ALGORITHM", str, "HS256"),
+    ("enable_auth", "ENABLE_AUTH", _to_bool, "false"),
+    
+    # Database Configuration (if needed)
+    ("enable_database", "ENABLE_DATABASE", _to_bool, "false"),
+    ("database_url", "DATABASE_URL", None, None),
+    
+    # Fraud Detection Configuration
+    ("fraud_threshold", "FRAUD_THRESHOLD", float, "0.7"),
+    ("high_risk_threshold", "HIGH_RISK_THRESHOLD", float, "0.9"),
+    ("max_transaction_amount", "MAX_TRANSACTION_AMOUNT", float, "1000000.0"),
+    ("currency", "CURRENCY", str, "PKR"),
+    ("timezone", "TIMEZONE", str, "Asia/Karachi"),
+    ("business_hours_start", "BUSINESS_HOURS_START", int, "9"),
+    ("business_hours_end", "BUSINESS_HOURS_END", int, "17"),
+    ("alert_email", "ALERT_EMAIL", None, None),
+    ("model_retrain_interval", "MODEL_RETRAIN_INTERVAL", int, "24"),
+    ("feature_importance_threshold", "FEATURE_IMPORTANCE_THRESHOLD", float, "0.1"),
+    
+    # Logging Configuration
+    ("log_level", "LOG_LEVEL", str, "INFO"),
+    ("log_format", "LOG_FORMAT", str, "%(asctime)s - %(name)s - %(levelname)s - %(message)s"),
+)
+
+
 class Settings:
     """Application settings loaded from environment variables."""
     
+    __slots__ = tuple(name for name, _, _, _ in _FIELDS) + ("cors_origins", "_env_lower")
+    
+    host: str
+    port: int
+    debug: bool
+    reload: bool
+    app_name: str
+    app_version: str
+    environment: str
+    nicegui_mount_path: str
+    secret_key: str
+    algorithm: str
+    enable_auth: bool
+    cors_origins: list
+    enable_database: bool
+    database_url: Optional[str]
+    fraud_threshold: float
+    high_risk_threshold: float
+    max_transaction_amount: float
+    currency: str
+    timezone: str
+    business_hours_start: int
+    business_hours_end: int
+    alert_email: Optional[str]
+    model_retrain_interval: int
+    feature_importance_threshold: float
+    log_level: str
+    log_format: str
+    
     def __init__(self):
-        # Server Configuration
-        self.host: str = os.getenv("HOST", "0.0.0.0")
-        self.port: int = int(os.getenv("PORT", "8000"))
-        self.debug: bool = os.getenv("DEBUG", "false").lower() == "true"
-        self.reload: bool = os.getenv("RELOAD", "false").lower() == "true"
-        
-        # Application Configuration
-        self.app_name: str = os.getenv("APP_NAME", "Pakistani Bank Fraud Detection System")
-        self.app_version: str = os.getenv("APP_VERSION", "1.0.0")
-        self.environment: str = os.getenv("ENVIRONMENT", "development")
+        env_get = os.environ.get
         
-        # Security Configuration
-        self.secret_key: str = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
-        self.cors_origins: list = self._parse_cors_origins()
+        for name, key, cast, default in _FIELDS:
+            value = env_get(key, default)
+            setattr(self, name, value if cast is None else cast(value))
         
-        # Database Configuration (if needed)
-        self.database_url: Optional[str] = os.getenv("DATABASE_URL")
-        
-        # Fraud Detection Configuration
-        self.fraud_threshold: float = float(os.getenv("FRAUD_THRESHOLD", "0.7"))
-        self.max_transaction_amount: float = float(os.getenv("MAX_TRANSACTION_AMOUNT", "1000000.0"))
-        
-        # Logging Configuration
-        self.log_level: str = os.getenv("LOG_LEVEL", "INFO")
-        self.log_format: str = os.getenv("LOG_FORMAT", "%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        self.cors_origins = self._parse_cors_origins()
+        self._env_lower = self.environment.lower()
     
     def _parse_cors_origins(self) -> list:
         """Parse CORS origins from environment variable."""
-        origins_str = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:8000")
-        return [origin.strip() for origin in origins_str.split(",") if origin.strip()]
+        origins_str = os.environ.get("CORS_ORIGINS", "http://localhost:3000,http://localhost:8000")
+        return [origin for origin in _CORS_SPLIT.split(origins_str.strip()) if origin]
     
     @property
     def is_production(self) -> bool:
         """Check if running in production environment."""
-        return self.environment.lower() == "production"
+        return self._env_lower == "production"
     
     @property
     def is_development(self) -> bool:
         """Check if running in development environment."""
-        return self.environment.lower() == "development"
+        return self._env_lower == "development"
     
     def get_database_config(self) -> dict:
         """Get database configuration dictionary."""
@@ -84,42 +151,48 @@ class Settings:
             errors.append(f"Invalid fraud threshold: {self.fraud_threshold}. Must be between 0.0 and 1.0.")
         
         # Validate secret key in production
-        if self.is_production and self.secret_key == "your-secret-key-change-in-production":
+        if self._env_lower == "production" and self.secret_key == _DEFAULT_SECRET_KEY:
             errors.append("SECRET_KEY must be changed in production environment.")
         
         if errors:
-            print("❌ Configuration validation errors:")
-            for error in errors:
-                print(f"  - {error}")
+            sys.stderr.write("❌ Configuration validation errors:\n" + "".join(f"  - {error}\n" for error in errors))
             return False
         
-        print("✅ Configuration validation passed")
+        sys.stdout.write("✅ Configuration validation passed\n")
         return True
     
     def display_config(self) -> None:
         """Display current configuration (excluding sensitive data)."""
-        print(f"🚀 {self.app_name} v{self.app_version}")
-        print(f"📍 Environment: {self.environment}")
-        print(f"🌐 Server: {self.host}:{self.port}")
-        print(f"🔍 Debug Mode: {self.debug}")
-        print(f"🎯 Fraud Threshold: {self.fraud_threshold}")
-        print(f"💰 Max Transaction: PKR {self.max_transaction_amount:,.2f}")
+        lines = [
+            f"🚀 {self.app_name} v{self.app_version}",
+            f"📍 Environment: {self.environment}",
+            f"🌐 Server: {self.host}:{self.port}",
+            f"🔍 Debug Mode: {self.debug}",
+            f"🎯 Fraud Threshold: {self.fraud_threshold}",
+            f"💰 Max Transaction: PKR {self.max_transaction_amount:,.2f}",
+        ]
         if self.database_url:
             # Mask sensitive parts of database URL
             masked_url = self.database_url.split('@')[-1] if '@' in self.database_url else "configured"
-            print(f"🗄️  Database: {masked_url}")
+            lines.append(f"🗄️  Database: {masked_url}")
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the global settings instance, creating it on first use."""
+    return Settings()
 
 
-def get_settings() -> Settings:
-    """Get the global settings instance."""
-    return settings
+def __getattr__(name: str):
+    """Lazily expose the global settings instance as ``settings``."""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Validate configuration on import
 if __name__ == "__main__":
+    settings = get_settings()
     settings.display_config()
-    settings.validate_config()
\ No newline at end of file
+    settings.validate_config()
@@ -14,19 +14,19 @@ imported and used by other modules as needed.
 """
 
 # This directory contains modules for:
-# - config.py: Application configuration and environment variables
 # - logging.py: Logging setup and configuration
 # - exceptions.py: Custom exception classes and error handling
 # - middleware.py: ASGI middleware for request/response processing
 # - security.py: Security-related utilities (CORS, authentication, etc.)
 # - health.py: Health check utilities
+# - scoring.py: Batch fraud scoring kernels
 # - utils.py: Utility functions
 # - database.py: Database utilities
 # - deployment.py: Deployment utilities
 # - error_handlers.py: Error handling utilities
 
 # Import core modules for easy access
-from app.core.config import settings
+from app.config import settings
 from app.core.logging import app_logger, get_logger
 from app.core.exceptions import (
     AppException,
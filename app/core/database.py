@@ -4,7 +4,7 @@ from contextlib import contextmanager
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase, Session
 
-from app.core.config import settings
+from app.config import settings
 from app.core.logging import app_logger
 
 class Base(DeclarativeBase):
@@ -18,23 +18,23 @@ def setup_database() -> None:
     """Initialize database connection and create tables if enabled."""
     global engine, SessionLocal
 
-    if not settings.ENABLE_DATABASE:
+    if not settings.enable_database:
         app_logger.info("Database is disabled by configuration.")
         return
 
-    if not settings.DATABASE_URL:
+    if not settings.database_url:
         app_logger.warning("Database URL not configured, but ENABLE_DATABASE is True.")
         return
 
     try:
         engine = create_engine(
-            settings.DATABASE_URL,
+            settings.database_url,
             pool_pre_ping=True,
             pool_recycle=3600,
-            echo=settings.DEBUG,
+            echo=settings.debug,
         )
         SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-        app_logger.info(f"Database connection established: {settings.DATABASE_URL.split('@')[-1].split('/')[-1]}")
+        app_logger.info(f"Database connection established: {settings.database_url.split('@')[-1].split('/')[-1]}")
         create_tables()
     except Exception as e:
         app_logger.error(f"Failed to connect to database: {e}")
@@ -74,7 +74,7 @@ def create_error_response(
     if isinstance(detail, str):
         content = {"detail": detail}
     else:
-        content = {"detail": [error.dict() for error in detail]}
+        content = {"detail": [error.model_dump() for error in detail]}
     
     return JSONResponse(
         status_code=status_code,
@@ -4,14 +4,90 @@ Provides comprehensive system health monitoring.
 """
 
 import time
-import psutil
-import platform
+from functools import lru_cache
+from importlib.util import find_spec
 from typing import Dict, Any
-from app.config import settings
+from app.config import get_settings
 from app.core.logging import get_logger
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    import json
+    
+    def _dumps(obj: Any) -> bytes:
+        """Serialize ``obj`` to compact JSON bytes."""
+        return json.dumps(obj, separators=(",", ":")).encode()
+
 logger = get_logger("health")
 
+# Bytes per GiB
+_GB = 1 << 30
+
+
+@lru_cache(maxsize=1)
+def _psutil():
+    """Import psutil on first use and prime its CPU counters.
+    
+    cpu_percent(interval=None) reports usage since the previous call, so
+    priming it lets check_system_resources sample without blocking.
+    """
+    import psutil
+    psutil.cpu_percent(interval=None)
+    return psutil
+
+
+# Required package -> importable top-level module
+_REQUIRED_PACKAGES = {
+    'nicegui': 'nicegui',
+    'uvicorn': 'uvicorn',
+    'pydantic': 'pydantic',
+    'httpx': 'httpx',
+    'numpy': 'numpy',
+    'python_dotenv': 'dotenv'
+}
+
+
+@lru_cache(maxsize=1)
+def _dependency_status() -> Dict[str, Any]:
+    """Probe the required packages once; installed packages don't change at runtime."""
+    required_packages = list(_REQUIRED_PACKAGES)
+    
+    dependency_status = {
+        "required_packages": required_packages,
+        "available_packages": [],
+        "missing_packages": [],
+        "status": "healthy"
+    }
+    
+    # find_spec only walks the import finders; it doesn't execute the package
+    for package, module_name in _REQUIRED_PACKAGES.items():
+        if find_spec(module_name) is None:
+            dependency_status["missing_packages"].append(package)
+        else:
+            dependency_status["available_packages"].append(package)
+    
+    if dependency_status["missing_packages"]:
+        dependency_status["status"] = "error"
+        dependency_status["error"] = f"Missing packages: {', '.join(dependency_status['missing_packages'])}"
+    
+    return dependency_status
+
+
+@lru_cache(maxsize=1)
+def _platform_info() -> Dict[str, Any]:
+    """Collect platform details once; they are fixed for the process lifetime."""
+    import platform
+    return {
+        "platform": platform.platform(),
+        "python_version": platform.python_version(),
+        "architecture": platform.architecture()[0],
+        "processor": platform.processor() or "Unknown",
+        "hostname": platform.node(),
+        "status": "healthy"
+    }
+
 
 class HealthCheck:
     """System health check utilities."""
@@ -20,25 +96,25 @@ class HealthCheck:
     def check_system_resources() -> Dict[str, Any]:
         """Check system resource usage."""
         try:
-            # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
+            psutil = _psutil()
+            
+            # CPU usage since the previous sample (non-blocking)
+            cpu_percent = psutil.cpu_percent(interval=None)
             
             # Memory usage
             memory = psutil.virtual_memory()
             memory_percent = memory.percent
-            memory_available_gb = memory.available / (1024**3)
             
             # Disk usage
             disk = psutil.disk_usage('/')
             disk_percent = disk.percent
-            disk_free_gb = disk.free / (1024**3)
             
             return {
                 "cpu_usage_percent": cpu_percent,
                 "memory_usage_percent": memory_percent,
-                "memory_available_gb": round(memory_available_gb, 2),
+                "memory_available_gb": memory.available * 100 // _GB / 100,
                 "disk_usage_percent": disk_percent,
-                "disk_free_gb": round(disk_free_gb, 2),
+                "disk_free_gb": disk.free * 100 // _GB / 100,
                 "status": "healthy" if cpu_percent < 80 and memory_percent < 80 and disk_percent < 90 else "warning"
             }
         except Exception as e:
@@ -52,6 +128,7 @@ class HealthCheck:
     def check_application_config() -> Dict[str, Any]:
         """Check application configuration."""
         try:
+            settings = get_settings()
             config_status = {
                 "app_name": settings.app_name,
                 "app_version": settings.app_version,
@@ -78,46 +155,13 @@ class HealthCheck:
     @staticmethod
     def check_dependencies() -> Dict[str, Any]:
         """Check if all required dependencies are available."""
-        required_packages = [
-            'nicegui',
-            'uvicorn',
-            'pydantic',
-            'httpx',
-            'python_dotenv'
-        ]
-        
-        dependency_status = {
-            "required_packages": required_packages,
-            "available_packages": [],
-            "missing_packages": [],
-            "status": "healthy"
-        }
-        
-        for package in required_packages:
-            try:
-                __import__(package.replace('-', '_'))
-                dependency_status["available_packages"].append(package)
-            except ImportError:
-                dependency_status["missing_packages"].append(package)
-        
-        if dependency_status["missing_packages"]:
-            dependency_status["status"] = "error"
-            dependency_status["error"] = f"Missing packages: {', '.join(dependency_status['missing_packages'])}"
-        
-        return dependency_status
+        return dict(_dependency_status())
     
     @staticmethod
     def check_platform_info() -> Dict[str, Any]:
         """Get platform and Python version information."""
         try:
-            return {
-                "platform": platform.platform(),
-                "python_version": platform.python_version(),
-                "architecture": platform.architecture()[0],
-                "processor": platform.processor() or "Unknown",
-                "hostname": platform.node(),
-                "status": "healthy"
-            }
+            return dict(_platform_info())
         except Exception as e:
             logger.error(f"Error getting platform info: {e}")
             return {
@@ -130,31 +174,78 @@ class HealthCheck:
         """Perform comprehensive health check."""
         timestamp = time.time()
         
+        # Run the checks in report order; all are cheap (non-blocking psutil samples
+        # and cached results), so a thread-pool hop would cost more than it saves
+        checks = {check_name: check() for check_name, check in _CHECKS}
+        overall_status = _overall_status(result["status"] for result in checks.values())
+        
         health_report = {
             "timestamp": timestamp,
-            "status": "healthy",
-            "checks": {
-                "system_resources": HealthCheck.check_system_resources(),
-                "application_config": HealthCheck.check_application_config(),
-                "dependencies": HealthCheck.check_dependencies(),
-                "platform_info": HealthCheck.check_platform_info()
-            }
+            "status": overall_status,
+            "checks": checks
         }
         
-        # Determine overall status
-        check_statuses = [check["status"] for check in health_report["checks"].values()]
-        
-        if "error" in check_statuses:
-            health_report["status"] = "error"
-        elif "warning" in check_statuses:
-            health_report["status"] = "warning"
-        else:
-            health_report["status"] = "healthy"
-        
         # Log health check result
-        logger.info(f"Health check completed with status: {health_report['status']}")
+        logger.info("Health check completed with status: %s", overall_status)
         
         return health_report
+    
+    @staticmethod
+    def check_all_json() -> bytes:
+        """Perform comprehensive health check and return the report as JSON.
+        
+        Only system_resources is re-run and re-serialized; the other checks
+        are fixed for the process lifetime and spliced in pre-encoded.
+        """
+        timestamp = time.time()
+        static_status, static_json = _static_checks_json()
+        system_resources = HealthCheck.check_system_resources()
+        overall_status = _overall_status((system_resources["status"], static_status))
+        
+        logger.info("Health check completed with status: %s", overall_status)
+        
+        head = _dumps({"timestamp": timestamp, "status": overall_status})
+        return b"".join((
+            head[:-1], b',"checks":{"system_resources":', _dumps(system_resources),
+            b",", static_json, b"}}"
+        ))
+
+
+def _overall_status(statuses) -> str:
+    """Return the worst of the given check statuses."""
+    overall_status = "healthy"
+    for status in statuses:
+        if status == "error":
+            return "error"
+        if status == "warning":
+            overall_status = "warning"
+    return overall_status
+
+
+# Checks run by HealthCheck.check_all, in report order
+_CHECKS = (
+    ("system_resources", HealthCheck.check_system_resources),
+    ("application_config", HealthCheck.check_application_config),
+    ("dependencies", HealthCheck.check_dependencies),
+    ("platform_info", HealthCheck.check_platform_info),
+)
+
+# Checks whose results don't change while the process runs
+_STATIC_CHECKS = _CHECKS[1:]
+
+
+@lru_cache(maxsize=1)
+def _static_checks_json() -> tuple:
+    """Run the static checks once; return their worst status and JSON members."""
+    checks = {check_name: check() for check_name, check in _STATIC_CHECKS}
+    status = _overall_status(result["status"] for result in checks.values())
+    # Strip the enclosing braces so the members can be spliced into "checks"
+    return status, _dumps(checks)[1:-1]
+
+
+def is_healthy() -> bool:
+    """Return True if every health check reports a healthy status."""
+    return HealthCheck.check_all()["status"] == "healthy"
 
 
 # Perform initial health check on import
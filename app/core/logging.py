@@ -5,8 +5,9 @@ Provides structured logging with proper formatting and levels.
 
 import logging
 import sys
+from functools import lru_cache
 from typing import Optional
-from app.config import settings
+from app.config import get_settings
 
 
 class ColoredFormatter(logging.Formatter):
@@ -22,12 +23,24 @@ class ColoredFormatter(logging.Formatter):
         'RESET': '\033[0m'      # Reset
     }
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Precompute the colored level names once per formatter
+        reset = self.COLORS['RESET']
+        self._colored = {
+            level: f"{color}{level}{reset}"
+            for level, color in self.COLORS.items()
+            if level != 'RESET'
+        }
+    
     def format(self, record):
-        # Add color to the log level
-        if record.levelname in self.COLORS:
-            record.levelname = f"{self.COLORS[record.levelname]}{record.levelname}{self.COLORS['RESET']}"
-        
-        return super().format(record)
+        # Add color to the log level, restoring it so other handlers see the plain name
+        levelname = record.levelname
+        record.levelname = self._colored.get(levelname, levelname)
+        try:
+            return super().format(record)
+        finally:
+            record.levelname = levelname
 
 
 def setup_logging(
@@ -46,21 +59,26 @@ def setup_logging(
     Returns:
         Configured logger instance
     """
+    settings = get_settings()
     logger_name = name or settings.app_name
     log_level = level or settings.log_level
     log_format = format_string or settings.log_format
     
+    numeric_level = getattr(logging, log_level.upper())
+    
     # Create logger
     logger = logging.getLogger(logger_name)
-    logger.setLevel(getattr(logging, log_level.upper()))
+    logger.setLevel(numeric_level)
     
     # Remove existing handlers to avoid duplicates
-    for handler in logger.handlers[:]:
-        logger.removeHandler(handler)
+    if logger.handlers:
+        for handler in logger.handlers:
+            handler.close()
+        logger.handlers.clear()
     
     # Create console handler
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, log_level.upper()))
+    console_handler.setLevel(numeric_level)
     
     # Create formatter
     if settings.is_development:
@@ -79,15 +97,17 @@ def setup_logging(
     return logger
 
 
+@lru_cache(maxsize=128)
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance for a specific module."""
-    return logging.getLogger(f"{settings.app_name}.{name}")
+    return logging.getLogger(f"{get_settings().app_name}.{name}")
 
 
 # Global application logger
 app_logger = setup_logging()
 
 # Log startup message
-app_logger.info(f"🚀 Starting {settings.app_name} v{settings.app_version}")
-app_logger.info(f"📍 Environment: {settings.environment}")
-app_logger.info(f"🔍 Debug Mode: {settings.debug}")
\ No newline at end of file
+_settings = get_settings()
+app_logger.info(f"🚀 Starting {_settings.app_name} v{_settings.app_version}")
+app_logger.info(f"📍 Environment: {_settings.environment}")
+app_logger.info(f"🔍 Debug Mode: {_settings.debug}")
\ No newline at end of file
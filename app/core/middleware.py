@@ -1,3 +1,4 @@
+import logging
 import time
 from typing import Dict, List, Optional, Set
 
@@ -6,22 +7,22 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
-from app.core.config import settings
+from app.config import settings
 from app.core.logging import app_logger
 
 def setup_middleware(app: FastAPI) -> None:
     """Set up global middleware for the FastAPI application."""
 
     # CORS Middleware
-    if settings.CORS_ORIGINS:
+    if settings.cors_origins:
         app.add_middleware(
             CORSMiddleware,
-            allow_origins=[str(origin) for origin in settings.CORS_ORIGINS],
+            allow_origins=[str(origin) for origin in settings.cors_origins],
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
         )
-        app_logger.info(f"CORS middleware enabled for origins: {settings.CORS_ORIGINS}")
+        app_logger.info(f"CORS middleware enabled for origins: {settings.cors_origins}")
     else:
         app_logger.warning("CORS_ORIGINS not set. CORS middleware is disabled.")
 
@@ -30,10 +31,10 @@ def setup_middleware(app: FastAPI) -> None:
     app_logger.info("GZip middleware enabled.")
 
     # Session Middleware (only if authentication is enabled and secret key is provided)
-    if settings.ENABLE_AUTH and settings.SECRET_KEY:
-        app.add_middleware(SessionMiddleware, secret_key=settings.SECRET_KEY)
+    if settings.enable_auth and settings.secret_key:
+        app.add_middleware(SessionMiddleware, secret_key=settings.secret_key)
         app_logger.info("Session middleware enabled.")
-    elif settings.ENABLE_AUTH and not settings.SECRET_KEY:
+    elif settings.enable_auth and not settings.secret_key:
         app_logger.warning("SECRET_KEY not set. Session middleware disabled despite ENABLE_AUTH.")
     else:
         app_logger.info("Session middleware disabled as authentication is not enabled.")
@@ -45,8 +46,9 @@ def setup_middleware(app: FastAPI) -> None:
         response = await call_next(request)
         process_time = time.time() - start_time
         response.headers["X-Process-Time"] = str(process_time)
-        app_logger.debug(f"Request processed in {process_time:.4f} seconds.",
-                         extra={"path": request.url.path, "method": request.method, "process_time": process_time})
+        if app_logger.isEnabledFor(logging.DEBUG):
+            app_logger.debug("Request processed in %.4f seconds.", process_time,
+                             extra={"path": request.url.path, "method": request.method, "process_time": process_time})
         return response
     app_logger.info("Request timing middleware enabled.")
 
@@ -1,7 +1,7 @@
 from nicegui import ui, app as nicegui_app
 from fastapi import FastAPI
 
-from app.core.config import settings
+from app.config import settings
 from app.core.logging import app_logger
 
 def setup_nicegui(fastapi_app: FastAPI, ui_instance=None, settings_instance=None):
@@ -20,12 +20,12 @@ def setup_nicegui(fastapi_app: FastAPI, ui_instance=None, settings_instance=None
         config = settings_instance or settings
         
         # Default mount path if not specified
-        mount_path = getattr(config, 'NICEGUI_MOUNT_PATH', '/')
+        mount_path = getattr(config, 'nicegui_mount_path', '/')
         
         # Mount NiceGUI to FastAPI
         ui_obj.run_with(fastapi_app, 
                     mount_path=mount_path, 
-                    storage_secret=config.SECRET_KEY)
+                    storage_secret=config.secret_key)
         
         app_logger.info(f"NiceGUI mounted at {mount_path}")
         app_logger.info("NiceGUI setup complete.")
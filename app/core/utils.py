@@ -7,7 +7,7 @@ import pkgutil
 from pathlib import Path
 
 from app.core.logging import app_logger
-from app.core.config import settings
+from app.config import settings
 
 def setup_routers(app: FastAPI, api_prefix: str = "/api") -> None:
     """Automatically set up all routers in the app/api directory.
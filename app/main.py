@@ -4,73 +4,154 @@ UI components and page definitions using NiceGUI framework.
 """
 
 from nicegui import ui, app
+from nicegui.json import NiceGUIJSONResponse
 import asyncio
-from typing import Dict, Any
+import itertools
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
 import time
 
+import numpy as np
+
 from app.config import settings
 from app.core.logging import get_logger
 from app.core.health import HealthCheck
+from app.core import scoring
 
 logger = get_logger("main")
 
+# Shared generator for the demonstration random risk component
+_np_rng = np.random.default_rng()
+
+# Scoring thresholds, fixed for the process lifetime
+_MAX_AMT = settings.max_transaction_amount
+_HIGH_AMT = _MAX_AMT * 0.8
+_THR = settings.fraud_threshold
+
+# Submissions are coalesced into batches of up to _BATCH_MAX, waiting at
+# most _BATCH_WINDOW seconds for more to arrive after the first
+_BATCH_MAX = 256
+_BATCH_WINDOW = 0.005
+
+
+class TransactionRing:
+    """Fixed-capacity columnar store of the most recent transaction results."""
+    
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self.count = 0
+        
+        # Numeric columns; FP32 is plenty for analytics since display
+        # strings are formatted from the full-precision values
+        self.amounts = np.empty(capacity, dtype=np.float32)
+        self.risk_scores = np.empty(capacity, dtype=np.float32)
+        self.is_fraud = np.empty(capacity, dtype=np.bool_)
+        self.timestamp_ns = np.empty(capacity, dtype=np.int64)
+        
+        # Display columns
+        self.transaction_ids = np.empty(capacity, dtype=object)
+        self.statuses = np.empty(capacity, dtype=object)
+        self.amount_strs = np.empty(capacity, dtype=object)
+        self.risk_strs = np.empty(capacity, dtype=object)
+    
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+    
+    def append(self, result: Dict[str, Any]) -> None:
+        """Store a transaction result, overwriting the oldest once full."""
+        i = self.count % self.capacity
+        self.amounts[i] = np.float32(result["amount"])
+        self.risk_scores[i] = np.float32(result["risk_score"])
+        self.is_fraud[i] = result["is_fraud"]
+        self.timestamp_ns[i] = int(result["timestamp"] * 1_000_000_000)
+        self.transaction_ids[i] = result["transaction_id"]
+        self.statuses[i] = result["status"]
+        self.amount_strs[i] = result["amount_str"]
+        self.risk_strs[i] = result["risk_str"]
+        self.count += 1
+    
+    def recent_indices(self, n: int) -> np.ndarray:
+        """Ring positions of the last ``n`` transactions, newest first."""
+        return (self.count - 1 - np.arange(min(n, len(self)))) % self.capacity
+    
+    def recent(self, n: int) -> List[Dict[str, Any]]:
+        """Return the last ``n`` transactions as dicts, newest first."""
+        return [
+            {
+                "transaction_id": self.transaction_ids[i],
+                "amount": float(self.amounts[i]),
+                "risk_score": float(self.risk_scores[i]),
+                "is_fraud": bool(self.is_fraud[i]),
+                "timestamp": int(self.timestamp_ns[i]) / 1_000_000_000,
+                "status": self.statuses[i],
+                "amount_str": self.amount_strs[i],
+                "risk_str": self.risk_strs[i]
+            }
+            for i in self.recent_indices(n)
+        ]
+
 
 class FraudDetectionUI:
     """Main UI class for the fraud detection system."""
     
     def __init__(self):
-        self.transaction_history = []
-        self.fraud_alerts = []
+        self.transaction_history = TransactionRing()
+        self.fraud_alerts = deque(maxlen=1000)
         self.system_stats = {
             "total_transactions": 0,
             "fraud_detected": 0,
-            "fraud_rate": 0.0,
             "last_update": time.time()
         }
+        # Bumped on every analyzed transaction so dashboards know to redraw
+        self.version = 0
+        # Set up by start_batching once the event loop is running
+        self._pending: Optional[asyncio.Queue] = None
+        self._batch_task: Optional[asyncio.Task] = None
+    
+    @property
+    def fraud_rate(self) -> float:
+        """Percentage of analyzed transactions flagged as fraud."""
+        total = self.system_stats["total_transactions"]
+        return 0.0 if not total else self.system_stats["fraud_detected"] * 100.0 / total
     
     async def analyze_transaction(self, transaction_data: Dict[str, Any]) -> Dict[str, Any]:
         """Simulate fraud analysis of a transaction."""
-        # Simulate processing time
-        await asyncio.sleep(0.5)
+        # One wall-clock read serves the ID fallback, timestamp and stats
+        now = time.time()
         
         # Simple fraud detection logic (replace with actual ML model)
         amount = float(transaction_data.get("amount", 0))
         account_age = int(transaction_data.get("account_age_days", 365))
         transaction_hour = int(transaction_data.get("hour", 12))
         
-        # Risk factors
-        risk_score = 0.0
-        risk_factors = []
-        
-        # High amount transactions
-        if amount > settings.max_transaction_amount * 0.8:
-            risk_score += 0.3
-            risk_factors.append("High transaction amount")
-        
-        # New account
-        if account_age < 30:
-            risk_score += 0.2
-            risk_factors.append("New account")
-        
-        # Unusual hours (late night/early morning)
-        if transaction_hour < 6 or transaction_hour > 22:
-            risk_score += 0.1
-            risk_factors.append("Unusual transaction time")
-        
-        # Random factor for demonstration
-        import random
-        risk_score += random.uniform(0, 0.4)
+        risk_score, is_fraud = await self._score(amount, account_age, transaction_hour)
         
-        is_fraud = risk_score >= settings.fraud_threshold
+        # Risk factors are only reported for flagged transactions
+        risk_factors = []
+        if is_fraud:
+            # High amount transactions
+            if amount > _HIGH_AMT:
+                risk_factors.append("High transaction amount")
+            
+            # New account
+            if account_age < 30:
+                risk_factors.append("New account")
+            
+            # Unusual hours (late night/early morning)
+            if transaction_hour < 6 or transaction_hour > 22:
+                risk_factors.append("Unusual transaction time")
         
         result = {
-            "transaction_id": transaction_data.get("transaction_id", f"TXN_{int(time.time())}"),
+            "transaction_id": transaction_data.get("transaction_id") or f"TXN_{int(now)}",
             "amount": amount,
             "risk_score": round(risk_score, 3),
             "is_fraud": is_fraud,
             "risk_factors": risk_factors,
-            "timestamp": time.time(),
-            "status": "FRAUD DETECTED" if is_fraud else "APPROVED"
+            "timestamp": now,
+            "status": "FRAUD DETECTED" if is_fraud else "APPROVED",
+            # Display strings, formatted once since results never change
+            "amount_str": f"PKR {amount:,.2f}",
+            "risk_str": f"Risk: {risk_score:.3f}"
         }
         
         # Update statistics
@@ -79,38 +160,166 @@ class FraudDetectionUI:
             self.system_stats["fraud_detected"] += 1
             self.fraud_alerts.append(result)
         
-        self.system_stats["fraud_rate"] = (
-            self.system_stats["fraud_detected"] / self.system_stats["total_transactions"] * 100
-        )
-        self.system_stats["last_update"] = time.time()
+        self.system_stats["last_update"] = now
         
         self.transaction_history.append(result)
-        
-        # Keep only last 100 transactions
-        if len(self.transaction_history) > 100:
-            self.transaction_history = self.transaction_history[-100:]
+        self.version += 1
         
         return result
+    
+    def start_batching(self) -> None:
+        """Start coalescing concurrent analyze_transaction calls into batches."""
+        if self._batch_task is None:
+            self._pending = asyncio.Queue()
+            self._batch_task = asyncio.create_task(self._batch_loop())
+    
+    async def _score(self, amount: float, account_age: int, transaction_hour: int) -> Tuple[float, bool]:
+        """Score one transaction, through the batcher when it is running."""
+        if self._pending is None:
+            risk_scores, fraud_flags = self.analyze_batch(
+                np.array([amount]), np.array([account_age]), np.array([transaction_hour])
+            )
+            return float(risk_scores[0]), bool(fraud_flags[0])
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._pending.put((amount, account_age, transaction_hour, future))
+        return await future
+    
+    async def _batch_loop(self) -> None:
+        """Drain pending submissions and score each batch with analyze_batch."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._pending.get()]
+            deadline = loop.time() + _BATCH_WINDOW
+            while len(batch) < _BATCH_MAX:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._pending.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            n = len(batch)
+            try:
+                risk_scores, fraud_flags = self.analyze_batch(
+                    np.fromiter((item[0] for item in batch), dtype=np.float64, count=n),
+                    np.fromiter((item[1] for item in batch), dtype=np.int64, count=n),
+                    np.fromiter((item[2] for item in batch), dtype=np.int64, count=n)
+                )
+            except Exception as e:
+                logger.error(f"Error scoring transaction batch: {e}")
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (*_, future), risk_score, is_fraud in zip(batch, risk_scores.tolist(), fraud_flags.tolist()):
+                if not future.done():
+                    future.set_result((risk_score, is_fraud))
+    
+    def analyze_batch(self, amounts: np.ndarray, ages: np.ndarray, hours: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Score many transactions at once.
+        
+        Args:
+            amounts: Transaction amounts in PKR
+            ages: Account ages in days
+            hours: Transaction hours (0-23)
+        
+        Returns:
+            Tuple of (risk_scores, is_fraud) arrays
+        """
+        n = amounts.shape[0]
+        risk_scores = np.empty(n, dtype=np.float32)
+        is_fraud = np.empty(n, dtype=np.bool_)
+        
+        # Random factor for demonstration
+        random_factors = _np_rng.random(n, dtype=np.float32) * np.float32(0.4)
+        
+        scoring.score_batch(
+            amounts, ages, hours, random_factors,
+            _MAX_AMT, _THR, risk_scores, is_fraud
+        )
+        return risk_scores, is_fraud
 
 
 # Global UI instance
 fraud_ui = FraudDetectionUI()
 
+# Health check detail rendering, specialized to the HealthCheck report schema
+_DETAIL_CLASSES = 'text-sm text-gray-700'
+_DETAIL_MONO_CLASSES = 'text-sm text-gray-700 font-mono'
+_CHECK_CARD_CLASSES = {
+    'healthy': 'safe-card',
+    'warning': 'warning-card',
+    'error': 'fraud-card'
+}
+
+
+def _detail_renderer(*keys: str, classes: str = _DETAIL_CLASSES, optional: Tuple[str, ...] = ()):
+    """Build a renderer for a check with a fixed set of fields.
+    
+    The renderer returns (text, classes) pairs for the given keys, plus any
+    optional keys present in the check result.
+    """
+    templates = tuple((key, f"{key}: {{}}") for key in keys)
+    optional_templates = tuple((key, f"{key}: {{}}") for key in optional)
+    
+    def render(check_data: Dict[str, Any]) -> List[Tuple[str, str]]:
+        lines = [(template.format(check_data[key]), classes) for key, template in templates]
+        for key, template in optional_templates:
+            if key in check_data:
+                lines.append((template.format(check_data[key]), _DETAIL_CLASSES))
+        return lines
+    
+    return render
+
+
+def _render_generic(check_data: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Render any check result, e.g. one that failed with an error."""
+    return [
+        (f"{key}: {value}", _DETAIL_MONO_CLASSES if isinstance(value, (list, dict)) else _DETAIL_CLASSES)
+        for key, value in check_data.items() if key != 'status'
+    ]
+
+
+_HEALTH_RENDERERS = {
+    'system_resources': _detail_renderer(
+        'cpu_usage_percent', 'memory_usage_percent', 'memory_available_gb',
+        'disk_usage_percent', 'disk_free_gb'
+    ),
+    'application_config': _detail_renderer(
+        'app_name', 'app_version', 'environment', 'debug_mode',
+        'fraud_threshold', 'max_transaction_amount', optional=('warning',)
+    ),
+    'dependencies': _detail_renderer(
+        'required_packages', 'available_packages', 'missing_packages',
+        classes=_DETAIL_MONO_CLASSES
+    ),
+    'platform_info': _detail_renderer(
+        'platform', 'python_version', 'architecture', 'processor', 'hostname'
+    ),
+}
+
+# Health report shared by all viewers for a few seconds
+_HEALTH_TTL = 5.0
+_health_cache = {"ts": 0.0, "data": None}
+_health_lock = asyncio.Lock()
+
+
+async def get_health_report() -> Dict[str, Any]:
+    """Return a recent health report, re-running the checks at most once per TTL."""
+    async with _health_lock:
+        if _health_cache["data"] is None or time.monotonic() - _health_cache["ts"] > _HEALTH_TTL:
+            loop = asyncio.get_running_loop()
+            _health_cache["data"] = await loop.run_in_executor(None, HealthCheck.check_all)
+            _health_cache["ts"] = time.monotonic()
+    return _health_cache["data"]
+
 
 @ui.page('/')
 async def index():
     """Main dashboard page."""
-    ui.add_head_html('''
-        <style>
-            .fraud-card { border-left: 4px solid #ef4444; }
-            .safe-card { border-left: 4px solid #10b981; }
-            .warning-card { border-left: 4px solid #f59e0b; }
-            .stat-card { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); }
-            .transaction-row { transition: all 0.3s ease; }
-            .transaction-row:hover { background-color: #f8fafc; }
-        </style>
-    ''')
-    
     with ui.column().classes('w-full max-w-7xl mx-auto p-4'):
         # Header
         with ui.row().classes('w-full items-center justify-between mb-6'):
@@ -158,9 +367,24 @@ async def index():
             ui.label('📊 Recent Transactions').classes('text-xl font-semibold mb-4')
             transactions_container = ui.column().classes('w-full')
             
-            # Initial empty state
             with transactions_container:
-                ui.label('No transactions analyzed yet. Use the form above to analyze your first transaction.').classes('text-gray-500 text-center py-8')
+                # Initial empty state
+                empty_label = ui.label('No transactions analyzed yet. Use the form above to analyze your first transaction.').classes('text-gray-500 text-center py-8')
+                
+                # Fixed slots reused for the 10 most recent transactions
+                transaction_slots = []
+                for _ in range(10):
+                    with ui.card().classes('safe-card p-3 mb-2 transaction-row') as card:
+                        with ui.row().classes('w-full items-center justify-between'):
+                            with ui.column().classes('flex-1'):
+                                id_label = ui.label().classes('font-semibold text-sm')
+                                amount_label = ui.label().classes('text-gray-700')
+                            
+                            with ui.column().classes('text-right'):
+                                state_label = ui.label().classes('text-green-600 font-bold text-sm')
+                                risk_label = ui.label().classes('text-gray-500 text-xs')
+                    card.set_visibility(False)
+                    transaction_slots.append((card, id_label, amount_label, state_label, risk_label))
         
         async def analyze_transaction_handler():
             """Handle transaction analysis."""
@@ -206,7 +430,7 @@ async def index():
                             ui.label(result['status']).classes(f'{status_color} font-bold')
                         
                         with ui.row().classes('w-full gap-4 mt-2'):
-                            ui.label(f"Amount: PKR {result['amount']:,.2f}").classes('text-gray-700')
+                            ui.label(f"Amount: {result['amount_str']}").classes('text-gray-700')
                             ui.label(f"Risk Score: {result['risk_score']:.3f}").classes('text-gray-700')
                         
                         if result['risk_factors']:
@@ -214,14 +438,6 @@ async def index():
                             for factor in result['risk_factors']:
                                 ui.label(f"• {factor}").classes('text-sm text-gray-600 ml-4')
                 
-                # Update statistics
-                total_label.text = str(fraud_ui.system_stats["total_transactions"])
-                fraud_label.text = str(fraud_ui.system_stats["fraud_detected"])
-                rate_label.text = f"{fraud_ui.system_stats['fraud_rate']:.1f}%"
-                
-                # Update transactions list
-                update_transactions_list()
-                
                 # Clear form
                 transaction_id.value = ''
                 amount.value = 50000
@@ -244,30 +460,49 @@ async def index():
         
         def update_transactions_list():
             """Update the transactions list display."""
-            transactions_container.clear()
+            # Show recent transactions (last 10)
+            recent_transactions = fraud_ui.transaction_history.recent(10)  # Newest first
+            empty_label.set_visibility(not recent_transactions)
             
-            if not fraud_ui.transaction_history:
-                with transactions_container:
-                    ui.label('No transactions analyzed yet.').classes('text-gray-500 text-center py-4')
+            for slot, txn in itertools.zip_longest(transaction_slots, recent_transactions):
+                card, id_label, amount_label, state_label, risk_label = slot
+                if txn is None:
+                    card.set_visibility(False)
+                    continue
+                
+                card_class = 'fraud-card' if txn['is_fraud'] else 'safe-card'
+                status_color = 'text-red-600' if txn['is_fraud'] else 'text-green-600'
+                
+                card.classes(replace=f'{card_class} p-3 mb-2 transaction-row')
+                id_label.text = f"ID: {txn['transaction_id']}"
+                amount_label.text = txn['amount_str']
+                state_label.text = txn['status']
+                state_label.classes(replace=f'{status_color} font-bold text-sm')
+                risk_label.text = txn['risk_str']
+                card.set_visibility(True)
+        
+        rendered_version = fraud_ui.version
+        
+        def refresh_dashboard():
+            """Redraw statistics and recent transactions if anything changed."""
+            nonlocal rendered_version
+            if rendered_version == fraud_ui.version:
                 return
+            rendered_version = fraud_ui.version
             
-            # Show recent transactions (last 10)
-            recent_transactions = fraud_ui.transaction_history[-10:][::-1]  # Reverse to show newest first
-            
-            with transactions_container:
-                for txn in recent_transactions:
-                    card_class = 'fraud-card' if txn['is_fraud'] else 'safe-card'
-                    
-                    with ui.card().classes(f'{card_class} p-3 mb-2 transaction-row'):
-                        with ui.row().classes('w-full items-center justify-between'):
-                            with ui.column().classes('flex-1'):
-                                ui.label(f"ID: {txn['transaction_id']}").classes('font-semibold text-sm')
-                                ui.label(f"PKR {txn['amount']:,.2f}").classes('text-gray-700')
-                            
-                            with ui.column().classes('text-right'):
-                                status_color = 'text-red-600' if txn['is_fraud'] else 'text-green-600'
-                                ui.label(txn['status']).classes(f'{status_color} font-bold text-sm')
-                                ui.label(f"Risk: {txn['risk_score']:.3f}").classes('text-gray-500 text-xs')
+            total_label.text = str(fraud_ui.system_stats["total_transactions"])
+            fraud_label.text = str(fraud_ui.system_stats["fraud_detected"])
+            rate_label.text = f"{fraud_ui.fraud_rate:.1f}%"
+            update_transactions_list()
+        
+        # Coalesce UI updates into at most one redraw per second
+        ui.timer(1.0, refresh_dashboard)
+
+
+@app.get('/healthz', response_class=NiceGUIJSONResponse)
+async def healthz() -> NiceGUIJSONResponse:
+    """Machine-readable health report for liveness probes and monitoring."""
+    return NiceGUIJSONResponse(await get_health_report())
 
 
 @ui.page('/health')
@@ -290,7 +525,7 @@ async def health_page():
                 ui.label('Checking system health...').classes('text-gray-600')
             
             try:
-                health_data = HealthCheck.check_all()
+                health_data = await get_health_report()
                 
                 health_container.clear()
                 
@@ -308,22 +543,18 @@ async def health_page():
                     
                     # Individual checks
                     for check_name, check_data in health_data['checks'].items():
-                        check_color = {
-                            'healthy': 'safe-card',
-                            'warning': 'warning-card',
-                            'error': 'fraud-card'
-                        }.get(check_data['status'], 'safe-card')
+                        check_status = check_data['status']
+                        check_color = _CHECK_CARD_CLASSES.get(check_status, 'safe-card')
+                        
+                        # Errored checks only carry an error message, so fall back to the generic renderer
+                        renderer = _render_generic if check_status == 'error' else _HEALTH_RENDERERS.get(check_name, _render_generic)
                         
                         with ui.card().classes(f'{check_color} p-4 mb-4'):
                             ui.label(check_name.replace('_', ' ').title()).classes('font-semibold text-lg mb-2')
                             
                             # Display check details
-                            for key, value in check_data.items():
-                                if key != 'status':
-                                    if isinstance(value, (list, dict)):
-                                        ui.label(f"{key}: {str(value)}").classes('text-sm text-gray-700 font-mono')
-                                    else:
-                                        ui.label(f"{key}: {value}").classes('text-sm text-gray-700')
+                            for text, classes in renderer(check_data):
+                                ui.label(text).classes(classes)
             
             except Exception as e:
                 health_container.clear()
@@ -348,8 +579,13 @@ def main():
         # Display configuration
         settings.display_config()
         
+        # Compile the scoring kernel before the first request
+        scoring.warmup()
+        
         # Configure NiceGUI app
         app.add_static_files('/static', 'static')
+        ui.add_head_html('<link rel="stylesheet" href="/static/fraud.css">', shared=True)
+        app.on_startup(fraud_ui.start_batching)
         
         # Start the application
         logger.info(f"🚀 Starting server on {settings.host}:{settings.port}")
@@ -2,17 +2,56 @@
 Database configuration and connection management.
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, Text
+from sqlalchemy import create_engine, event, func, inspect, select, text, Index, Column, Integer, SmallInteger, String, Float, DateTime, Boolean, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool
 from datetime import datetime
+from typing import Any, Dict, List
 from app.config import settings
 
 # Database setup
-engine = create_engine(settings.database_url, connect_args={"check_same_thread": False})
+_IS_SQLITE = (settings.database_url or "").startswith("sqlite")
+
+engine = create_engine(
+    settings.database_url,
+    connect_args={"check_same_thread": False} if _IS_SQLITE else {},
+    poolclass=QueuePool,
+    pool_size=16,
+    max_overflow=32,
+    pool_pre_ping=True
+)
+
+if _IS_SQLITE:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Use WAL journaling so readers don't block on the writer, and skip per-commit fsyncs."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Risk levels and alert severities are stored as SmallInteger codes
+# (the index into RISK_LEVELS) and mapped to names only for display
+RISK_LEVELS = ("low", "medium", "high", "critical")
+_RISK_CODES = {level: code for code, level in enumerate(RISK_LEVELS)}
+
+
+def risk_code(level: str) -> int:
+    """Return the stored code for a risk level name (or RiskLevel member)."""
+    return _RISK_CODES[level]
+
+
+def risk_label(code: int) -> str:
+    """Return the risk level name for a stored code."""
+    return RISK_LEVELS[code]
+
 
 class CustomerDB(Base):
     """Customer database model."""
@@ -41,7 +80,7 @@ class TransactionDB(Base):
     account_number = Column(String, index=True)
     transaction_type = Column(String)
     amount = Column(Float)
-    currency = Column(String, default="PKR")
+    currency = "PKR"  # All transactions are in PKR, so it isn't stored per row
     timestamp = Column(DateTime, default=datetime.utcnow)
     location = Column(String)
     device_info = Column(String)
@@ -50,7 +89,7 @@ class TransactionDB(Base):
     description = Column(Text)
     is_successful = Column(Boolean, default=True)
     fraud_score = Column(Float, default=0.0)
-    risk_level = Column(String, default="low")
+    risk_level = Column(SmallInteger, default=0, index=True)
     is_flagged = Column(Boolean, default=False)
 
 
@@ -62,7 +101,7 @@ class FraudAlertDB(Base):
     transaction_id = Column(String, index=True)
     account_number = Column(String, index=True)
     alert_type = Column(String)
-    severity = Column(String)
+    severity = Column(SmallInteger)
     message = Column(Text)
     fraud_score = Column(Float)
     risk_factors = Column(Text)  # JSON string
@@ -72,6 +111,32 @@ class FraudAlertDB(Base):
     resolution_notes = Column(Text)
 
 
+# Composite index for per-account velocity queries, plus single-column
+# indexes for the dashboard's "today" range and high-risk score filters
+Index("ix_txn_acct_ts", TransactionDB.account_number, TransactionDB.timestamp.desc())
+Index("ix_txn_ts", TransactionDB.timestamp)
+Index("ix_txn_score", TransactionDB.fraud_score)
+
+# Flagged transactions are a small subset, so index only those rows
+_FLAGGED_TRANSACTIONS = TransactionDB.is_flagged == True
+Index(
+    "ix_txn_flagged_ts", TransactionDB.timestamp.desc(),
+    postgresql_where=_FLAGGED_TRANSACTIONS, sqlite_where=_FLAGGED_TRANSACTIONS
+)
+
+# Partial indexes over unresolved alerts only, matching the alert list queries
+_UNRESOLVED_ALERTS = FraudAlertDB.is_resolved == False
+Index(
+    "ix_alerts_active_ts", FraudAlertDB.timestamp.desc(),
+    postgresql_where=_UNRESOLVED_ALERTS, sqlite_where=_UNRESOLVED_ALERTS
+)
+Index(
+    "ix_alerts_sev_active", FraudAlertDB.severity, FraudAlertDB.timestamp.desc(),
+    postgresql_where=_UNRESOLVED_ALERTS, sqlite_where=_UNRESOLVED_ALERTS
+)
+Index("ix_alert_ts", FraudAlertDB.timestamp)
+
+
 def get_db() -> Session:
     """Get database session."""
     db = SessionLocal()
@@ -81,6 +146,122 @@ def get_db() -> Session:
         db.close()
 
 
+# Columns shown for transactions and alerts in review lists
+_FLAGGED_TRANSACTION_COLUMNS = (
+    TransactionDB.transaction_id,
+    TransactionDB.account_number,
+    TransactionDB.transaction_type,
+    TransactionDB.amount,
+    TransactionDB.timestamp,
+    TransactionDB.fraud_score,
+    TransactionDB.risk_level
+)
+
+_ACTIVE_ALERT_COLUMNS = (
+    FraudAlertDB.id,
+    FraudAlertDB.transaction_id,
+    FraudAlertDB.account_number,
+    FraudAlertDB.alert_type,
+    FraudAlertDB.severity,
+    FraudAlertDB.message,
+    FraudAlertDB.fraud_score,
+    FraudAlertDB.timestamp
+)
+
+
+def _flagged_rows_stmt(limit: int):
+    """Select the most recent flagged transactions' display columns."""
+    return (
+        select(*_FLAGGED_TRANSACTION_COLUMNS)
+        .where(TransactionDB.is_flagged == True)
+        .order_by(TransactionDB.timestamp.desc())
+        .limit(limit)
+    )
+
+
+def _active_alert_rows_stmt(limit: int):
+    """Select the most recent unresolved alerts' display columns."""
+    return (
+        select(*_ACTIVE_ALERT_COLUMNS)
+        .where(FraudAlertDB.is_resolved == False)
+        .order_by(FraudAlertDB.timestamp.desc())
+        .limit(limit)
+    )
+
+
+def _count(model, *criteria):
+    """Scalar subquery counting ``model`` rows matching ``criteria``."""
+    return select(func.count()).select_from(model).where(*criteria).scalar_subquery()
+
+
+# All dashboard counters in a single SELECT
+_DASHBOARD_COUNTS_STMT = select(
+    _count(TransactionDB).label("total_transactions"),
+    _count(TransactionDB, TransactionDB.is_flagged == True).label("flagged_transactions"),
+    _count(FraudAlertDB, FraudAlertDB.is_resolved == False).label("active_alerts"),
+    _count(
+        FraudAlertDB, FraudAlertDB.severity == risk_code("critical"), FraudAlertDB.is_resolved == False
+    ).label("critical_alerts")
+)
+
+
+def fetch_flagged_rows(limit: int = 20) -> List:
+    """Fetch the display columns of the most recent flagged transactions as row tuples."""
+    with engine.connect() as connection:
+        return connection.execute(_flagged_rows_stmt(limit)).all()
+
+
+def fetch_active_alert_rows(limit: int = 20) -> List:
+    """Fetch the display columns of the most recent unresolved alerts as row tuples."""
+    with engine.connect() as connection:
+        return connection.execute(_active_alert_rows_stmt(limit)).all()
+
+
+def fetch_dashboard_bundle(limit: int = 20) -> Dict[str, Any]:
+    """Fetch dashboard counters and recent flagged/alert rows over one connection."""
+    with engine.connect() as connection:
+        bundle = connection.execute(_DASHBOARD_COUNTS_STMT).one()._asdict()
+        bundle["flagged_rows"] = connection.execute(_flagged_rows_stmt(limit)).all()
+        bundle["active_alert_rows"] = connection.execute(_active_alert_rows_stmt(limit)).all()
+    return bundle
+
+
+# Columns that held risk level names before they were stored as codes
+_RISK_CODE_COLUMNS = (("transactions", "risk_level"), ("fraud_alerts", "severity"))
+
+
+def _migrate_risk_codes():
+    """Convert legacy string risk level/severity columns to SmallInteger codes."""
+    inspector = inspect(engine)
+    whens = " ".join(f"WHEN '{level}' THEN {code}" for code, level in enumerate(RISK_LEVELS))
+    
+    for table, column in _RISK_CODE_COLUMNS:
+        if not inspector.has_table(table):
+            continue
+        types = {col["name"]: col["type"] for col in inspector.get_columns(table)}
+        if isinstance(types.get(column), Integer):
+            continue
+        
+        # Rebuild the column, since SQLite can't change a column's type in place;
+        # indexes on it are dropped here and recreated by init_db
+        staging = f"{column}_code"
+        with engine.begin() as connection:
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {staging} SMALLINT"))
+            connection.execute(text(
+                f"UPDATE {table} SET {staging} = "
+                f"CASE {column} {whens} ELSE CAST({column} AS SMALLINT) END"
+            ))
+            for index in inspector.get_indexes(table):
+                if column in index["column_names"]:
+                    connection.execute(text(f"DROP INDEX {index['name']}"))
+            connection.execute(text(f"ALTER TABLE {table} DROP COLUMN {column}"))
+            connection.execute(text(f"ALTER TABLE {table} RENAME COLUMN {staging} TO {column}"))
+
+
 def init_db():
-    """Initialize database tables."""
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    """Initialize database tables and any indexes missing from existing tables."""
+    Base.metadata.create_all(bind=engine)
+    _migrate_risk_codes()
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
\ No newline at end of file
@@ -8,6 +8,7 @@ from typing import Dict, Any
 from sqlalchemy import text
 
 from core.database import engine
+from core.utils import ttl_cache
 from app.config import settings
 
 
@@ -15,6 +16,7 @@ class HealthCheck:
     """Health check utilities for monitoring system status."""
     
     @staticmethod
+    @ttl_cache(5)
     def check_database() -> Dict[str, Any]:
         """Check database connectivity and status."""
         try:
@@ -38,8 +40,8 @@ class HealthCheck:
     def check_ml_models() -> Dict[str, Any]:
         """Check ML model status."""
         try:
-            from services.fraud_detection import fraud_detector
-            model_stats = fraud_detector.get_model_stats()
+            from services.fraud_detection import get_fraud_detector
+            model_stats = get_fraud_detector().get_model_stats()
             
             return {
                 "status": "healthy",
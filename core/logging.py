@@ -2,20 +2,34 @@
 Logging configuration for the fraud detection system.
 """
 
+import atexit
 import logging
+import queue
 import sys
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any, Dict
 
+# Records are queued by the caller and written to stdout and the log file
+# by a background listener thread, so logging never blocks on disk I/O
+_log_queue = queue.SimpleQueue()
+_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+_stream_handler = logging.StreamHandler(sys.stdout)
+_stream_handler.setFormatter(_formatter)
+_file_handler = logging.FileHandler('fraud_detection.log', mode='a')
+_file_handler.setFormatter(_formatter)
+
+log_listener = QueueListener(_log_queue, _stream_handler, _file_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+# The queue handler only renders the message; the listener's handlers add the full format
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('fraud_detection.log', mode='a')
-    ]
-)
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
 
 # Create logger instance
 app_logger = logging.getLogger('fraud_detection')
@@ -28,9 +42,8 @@ class FraudLogger:
     def log_transaction(transaction_id: str, fraud_score: float, risk_level: str, risk_factors: list):
         """Log fraud detection result."""
         app_logger.info(
-            f"FRAUD_DETECTION - Transaction: {transaction_id}, "
-            f"Score: {fraud_score:.3f}, Risk: {risk_level}, "
-            f"Factors: {', '.join(risk_factors[:3])}"
+            "FRAUD_DETECTION - Transaction: %s, Score: %.3f, Risk: %s, Factors: %s",
+            transaction_id, fraud_score, risk_level, ', '.join(risk_factors[:3])
         )
     
     @staticmethod
@@ -38,21 +51,21 @@ class FraudLogger:
         """Log fraud alert creation."""
         masked_account = f"****{account_number[-4:]}" if len(account_number) > 4 else account_number
         app_logger.warning(
-            f"FRAUD_ALERT - Type: {alert_type}, Account: {masked_account}, "
-            f"Severity: {severity}, Score: {fraud_score:.3f}"
+            "FRAUD_ALERT - Type: %s, Account: %s, Severity: %s, Score: %.3f",
+            alert_type, masked_account, severity, fraud_score
         )
     
     @staticmethod
     def log_error(component: str, error: Exception, context: Dict[str, Any] = None):
         """Log system errors with context."""
         context_str = f", Context: {context}" if context else ""
-        app_logger.error(f"ERROR - Component: {component}, Error: {str(error)}{context_str}")
+        app_logger.error("ERROR - Component: %s, Error: %s%s", component, error, context_str)
     
     @staticmethod
     def log_performance(operation: str, duration_ms: float, details: Dict[str, Any] = None):
         """Log performance metrics."""
         details_str = f", Details: {details}" if details else ""
-        app_logger.info(f"PERFORMANCE - Operation: {operation}, Duration: {duration_ms:.2f}ms{details_str}")
+        app_logger.info("PERFORMANCE - Operation: %s, Duration: %.2fms%s", operation, duration_ms, details_str)
 
 
 # Global fraud logger instance
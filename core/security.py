@@ -6,11 +6,39 @@ import hashlib
 import secrets
 from typing import Optional
 from datetime import datetime, timedelta
+import numpy as np
 from passlib.context import CryptContext
 
-
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# CNIC/phone patterns are owned by the schemas so both layers validate alike
+from models.schemas import CNIC_RE, PHONE_RE
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Simplified check - in production, use IP geolocation services
+_SUSPICIOUS_PREFIXES = (
+    "192.168.",  # Local network (suspicious for online banking)
+    "10.0.",     # Private network
+    "172.16."    # Private network
+)
+
+# Password hashing: argon2id when the argon2-cffi backend is installed, with
+# bcrypt still accepted (and flagged for rehash) for existing hashes
+try:
+    import argon2  # noqa: F401
+    pwd_context = CryptContext(
+        schemes=["argon2", "bcrypt"],
+        deprecated="auto",
+        argon2__memory_cost=19456,
+        argon2__time_cost=2,
+        argon2__parallelism=1
+    )
+except ImportError:
+    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -30,32 +58,55 @@ def generate_session_token() -> str:
 
 def hash_sensitive_data(data: str) -> str:
     """Hash sensitive data for logging/storage."""
-    return hashlib.sha256(data.encode()).hexdigest()[:16]
+    # 8-byte BLAKE2b keeps the 16-hex-character output length of the old truncated
+    # SHA-256, but the values differ, so hashes stored before the switch won't match
+    return hashlib.blake2b(data.encode('utf-8'), digest_size=8).hexdigest()
 
 
 def validate_cnic(cnic: str) -> bool:
     """Validate Pakistani CNIC format."""
-    import re
-    pattern = r'^\d{5}-\d{7}-\d{1}$'
-    return bool(re.match(pattern, cnic))
+    return CNIC_RE.match(cnic) is not None
+
+
+def validate_cnic_batch(cnics: list) -> np.ndarray:
+    """Validate many CNICs with the same pattern as validate_cnic; returns a boolean mask."""
+    return np.fromiter((CNIC_RE.match(c) is not None for c in cnics), dtype=np.bool_, count=len(cnics))
 
 
 def validate_phone(phone: str) -> bool:
     """Validate Pakistani mobile phone format."""
-    import re
-    pattern = r'^(\+92|0)?3\d{9}$'
-    return bool(re.match(pattern, phone))
+    return PHONE_RE.match(phone) is not None
 
 
 def is_suspicious_ip(ip_address: str) -> bool:
     """Check if IP address is from suspicious location."""
-    # Simplified check - in production, use IP geolocation services
-    suspicious_ranges = [
-        "192.168.",  # Local network (suspicious for online banking)
-        "10.0.",     # Private network
-        "172.16."    # Private network
-    ]
-    return any(ip_address.startswith(range_) for range_ in suspicious_ranges)
+    return ip_address.startswith(_SUSPICIOUS_PREFIXES)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _velocity(ts_ns, now_ns, window_ns):
+        """Velocity score from int64 nanosecond timestamps."""
+        count = 0
+        for i in range(ts_ns.shape[0]):
+            if now_ns - ts_ns[i] <= window_ns:
+                count += 1
+        return min(count / 10.0, 1.0)
+else:
+    def _velocity(ts_ns, now_ns, window_ns):
+        """Velocity score from int64 nanosecond timestamps."""
+        count = np.count_nonzero(now_ns - ts_ns <= window_ns)
+        return min(count / 10.0, 1.0)
+
+
+def calculate_velocity_risk_ns(timestamps_ns: np.ndarray, time_window: int = 60) -> float:
+    """Calculate velocity risk from an int64 array of UTC nanosecond timestamps."""
+    if timestamps_ns.shape[0] == 0:
+        return 0.0
+    
+    now_ns = np.datetime64(datetime.utcnow(), "ns").astype(np.int64)
+    # Risk increases with transaction frequency in the last time_window minutes
+    return float(_velocity(timestamps_ns, now_ns, np.int64(time_window * 60 * 1_000_000_000)))
 
 
 def calculate_velocity_risk(transactions: list, time_window: int = 60) -> float:
@@ -63,13 +114,7 @@ def calculate_velocity_risk(transactions: list, time_window: int = 60) -> float:
     if not transactions:
         return 0.0
     
-    # Count transactions in the last time_window minutes
-    now = datetime.utcnow()
-    recent_transactions = [
-        t for t in transactions 
-        if (now - t.timestamp).total_seconds() <= time_window * 60
-    ]
-    
-    # Risk increases with transaction frequency
-    velocity_score = min(len(recent_transactions) / 10.0, 1.0)
-    return velocity_score
\ No newline at end of file
+    timestamps_ns = np.array(
+        [t.timestamp for t in transactions], dtype="datetime64[ns]"
+    ).astype(np.int64)
+    return calculate_velocity_risk_ns(timestamps_ns, time_window)
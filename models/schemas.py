@@ -2,12 +2,35 @@
 Pydantic models for data validation and serialization.
 """
 
+import re
 from datetime import datetime
 from typing import Optional, List
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator
 from enum import Enum
 
 
+# Pakistani CNIC and mobile formats, compiled once; core.security validates with these too
+CNIC_RE = re.compile(r'^\d{5}-\d{7}-\d{1}$')
+PHONE_RE = re.compile(r'^(\+92|0)?3\d{9}$')
+
+_match_cnic = CNIC_RE.match
+_match_phone = PHONE_RE.match
+
+
+def _check_cnic(cls, v):
+    """Validate Pakistani CNIC format."""
+    if _match_cnic(v) is None:
+        raise ValueError('CNIC must be in the format 12345-1234567-1')
+    return v
+
+
+def _check_phone(cls, v):
+    """Validate Pakistani mobile phone format."""
+    if _match_phone(v) is None:
+        raise ValueError('Phone must be a Pakistani mobile number')
+    return v
+
+
 class TransactionType(str, Enum):
     """Transaction types common in Pakistani banking."""
     DEPOSIT = "deposit"
@@ -33,8 +56,8 @@ class Customer(BaseModel):
     id: Optional[int] = None
     account_number: str = Field(..., min_length=10, max_length=20)
     name: str = Field(..., min_length=2, max_length=100)
-    cnic: str = Field(..., regex=r'^\d{5}-\d{7}-\d{1}$')  # Pakistani CNIC format
-    phone: str = Field(..., regex=r'^(\+92|0)?3\d{9}$')  # Pakistani mobile format
+    cnic: str  # Pakistani CNIC format
+    phone: str  # Pakistani mobile format
     email: Optional[str] = None
     city: str
     province: str
@@ -43,7 +66,11 @@ class Customer(BaseModel):
     is_active: bool = True
     risk_score: float = Field(default=0.0, ge=0.0, le=1.0)
     
-    @validator('province')
+    _validate_cnic = field_validator('cnic')(_check_cnic)
+    _validate_phone = field_validator('phone')(_check_phone)
+    
+    @field_validator('province')
+    @classmethod
     def validate_province(cls, v):
         """Validate Pakistani provinces."""
         valid_provinces = ['Punjab', 'Sindh', 'KPK', 'Balochistan', 'Gilgit-Baltistan', 'AJK']
@@ -56,12 +83,15 @@ class CustomerCreate(BaseModel):
     """Model for creating new customers."""
     account_number: str = Field(..., min_length=10, max_length=20)
     name: str = Field(..., min_length=2, max_length=100)
-    cnic: str = Field(..., regex=r'^\d{5}-\d{7}-\d{1}$')
-    phone: str = Field(..., regex=r'^(\+92|0)?3\d{9}$')
+    cnic: str
+    phone: str
     email: Optional[str] = None
     city: str
     province: str
     account_balance: float = Field(..., ge=0)
+    
+    _validate_cnic = field_validator('cnic')(_check_cnic)
+    _validate_phone = field_validator('phone')(_check_phone)
 
 
 class Transaction(BaseModel):
@@ -83,7 +113,8 @@ class Transaction(BaseModel):
     risk_level: RiskLevel = Field(default=RiskLevel.LOW)
     is_flagged: bool = False
     
-    @validator('amount')
+    @field_validator('amount')
+    @classmethod
     def validate_amount(cls, v):
         """Validate transaction amount limits."""
         if v > 10000000:  # 10 million PKR limit
@@ -2,183 +2,188 @@
 Alert management service for fraud detection.
 """
 
+from bisect import bisect_right
 from datetime import datetime
-from typing import List, Dict, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from typing import List, Dict, Optional, Tuple
+from sqlalchemy import case, desc, func, select
 import json
 
 from models.schemas import FraudAlert, Transaction, RiskLevel
-from core.database import FraudAlertDB, get_db
-from core.utils import serialize_risk_factors, parse_risk_factors
+from core.database import FraudAlertDB, SessionLocal, RISK_LEVELS
+from core.utils import serialize_risk_factors, parse_risk_factors, format_currency, mask_account_number
+
+
+# Columns read back into FraudAlert models, in _row_to_alert order
+_ALERT_COLUMNS = (
+    FraudAlertDB.id,
+    FraudAlertDB.transaction_id,
+    FraudAlertDB.account_number,
+    FraudAlertDB.alert_type,
+    FraudAlertDB.severity,
+    FraudAlertDB.message,
+    FraudAlertDB.fraud_score,
+    FraudAlertDB.risk_factors,
+    FraudAlertDB.timestamp,
+    FraudAlertDB.is_resolved,
+    FraudAlertDB.resolved_by,
+    FraudAlertDB.resolution_notes
+)
+
+# Fraud score bucket boundaries and the (alert_type, severity, message prefix)
+# for each bucket; bucket i covers scores in [_ALERT_THRESHOLDS[i-1], _ALERT_THRESHOLDS[i])
+_ALERT_THRESHOLDS = (0.4, 0.5, 0.7, 0.9)
+_ALERT_BUCKETS = (
+    ("ANOMALY_DETECTED", RiskLevel.LOW, "📊 ANOMALY"),
+    ("ANOMALY_DETECTED", RiskLevel.MEDIUM, "📊 ANOMALY"),
+    ("SUSPICIOUS_ACTIVITY", RiskLevel.MEDIUM, "🔍 SUSPICIOUS"),
+    ("HIGH_RISK_TRANSACTION", RiskLevel.HIGH, "⚠️ HIGH RISK"),
+    ("CRITICAL_FRAUD", RiskLevel.CRITICAL, "🚨 CRITICAL FRAUD ALERT")
+)
+
+
+def _classify(fraud_score: float) -> Tuple[str, RiskLevel, str]:
+    """Return the (alert_type, severity, message prefix) bucket for a fraud score."""
+    return _ALERT_BUCKETS[bisect_right(_ALERT_THRESHOLDS, fraud_score)]
+
+
+# RiskLevel members indexed by stored severity code, and the reverse mapping
+_SEVERITIES = tuple(RiskLevel(level) for level in RISK_LEVELS)
+_SEVERITY_CODES = {severity: code for code, severity in enumerate(_SEVERITIES)}
+_CRITICAL_CODE = _SEVERITY_CODES[RiskLevel.CRITICAL]
+_HIGH_CODE = _SEVERITY_CODES[RiskLevel.HIGH]
+
+
+def _row_to_alert(row) -> FraudAlert:
+    """Build a FraudAlert from an _ALERT_COLUMNS row without revalidating trusted DB data."""
+    return FraudAlert.model_construct(
+        id=row[0],
+        transaction_id=row[1],
+        account_number=row[2],
+        alert_type=row[3],
+        severity=_SEVERITIES[row[4]],
+        message=row[5],
+        fraud_score=row[6],
+        risk_factors=parse_risk_factors(row[7]),
+        timestamp=row[8],
+        is_resolved=row[9],
+        resolved_by=row[10],
+        resolution_notes=row[11]
+    )
 
 
 class AlertService:
     """Service for managing fraud alerts and notifications."""
     
-    def __init__(self):
-        self.db_session = None
-    
-    def get_db_session(self) -> Session:
-        """Get database session."""
-        if not self.db_session:
-            self.db_session = next(get_db())
-        return self.db_session
+    def build_alert(self, transaction: Transaction, fraud_score: float, risk_factors: List[str]) -> Tuple[FraudAlert, FraudAlertDB]:
+        """Build a fraud alert and its database row without saving it."""
+        # Determine alert type, severity and message
+        alert_type, severity, prefix = _classify(fraud_score)
+        message = self._generate_alert_message(transaction, prefix, risk_factors)
+        
+        # Create alert
+        alert = FraudAlert(
+            transaction_id=transaction.transaction_id,
+            account_number=transaction.account_number,
+            alert_type=alert_type,
+            severity=severity,
+            message=message,
+            fraud_score=fraud_score,
+            risk_factors=risk_factors,
+            timestamp=datetime.utcnow(),
+            is_resolved=False
+        )
+        
+        db_alert = FraudAlertDB(
+            transaction_id=alert.transaction_id,
+            account_number=alert.account_number,
+            alert_type=alert.alert_type,
+            severity=_SEVERITY_CODES[alert.severity],
+            message=alert.message,
+            fraud_score=alert.fraud_score,
+            risk_factors=serialize_risk_factors(alert.risk_factors),
+            timestamp=alert.timestamp,
+            is_resolved=alert.is_resolved
+        )
+        
+        return alert, db_alert
     
     def create_alert(self, transaction: Transaction, fraud_score: float, risk_factors: List[str]) -> FraudAlert:
         """Create a new fraud alert."""
-        db = self.get_db_session()
-        
-        try:
-            # Determine alert type and message
-            alert_type = self._determine_alert_type(fraud_score)
-            message = self._generate_alert_message(transaction, fraud_score, risk_factors)
-            severity = self._determine_severity(fraud_score)
-            
-            # Create alert
-            alert = FraudAlert(
-                transaction_id=transaction.transaction_id,
-                account_number=transaction.account_number,
-                alert_type=alert_type,
-                severity=severity,
-                message=message,
-                fraud_score=fraud_score,
-                risk_factors=risk_factors,
-                timestamp=datetime.utcnow(),
-                is_resolved=False
-            )
-            
-            # Save to database
-            db_alert = FraudAlertDB(
-                transaction_id=alert.transaction_id,
-                account_number=alert.account_number,
-                alert_type=alert.alert_type,
-                severity=alert.severity.value,
-                message=alert.message,
-                fraud_score=alert.fraud_score,
-                risk_factors=serialize_risk_factors(alert.risk_factors),
-                timestamp=alert.timestamp,
-                is_resolved=alert.is_resolved
-            )
-            
-            db.add(db_alert)
-            db.commit()
-            db.refresh(db_alert)
-            
-            alert.id = db_alert.id
-            return alert
-            
-        except Exception as e:
-            db.rollback()
-            raise e
+        return self.create_alerts_bulk([(transaction, fraud_score, risk_factors)])[0]
+    
+    def create_alerts_bulk(self, items: List[Tuple[Transaction, float, List[str]]]) -> List[FraudAlert]:
+        """Create fraud alerts for (transaction, fraud_score, risk_factors) items with one commit."""
+        built = [self.build_alert(*item) for item in items]
+        
+        # One batched INSERT ... RETURNING for all rows, committed when the block exits
+        with SessionLocal.begin() as db:
+            db.add_all([db_alert for _, db_alert in built])
+            db.flush()
+            for alert, db_alert in built:
+                alert.id = db_alert.id
+        
+        return [alert for alert, _ in built]
     
     def get_active_alerts(self, limit: int = 50) -> List[FraudAlert]:
         """Get active (unresolved) fraud alerts."""
-        db = self.get_db_session()
-        
-        db_alerts = db.query(FraudAlertDB).filter(
-            FraudAlertDB.is_resolved == False
-        ).order_by(desc(FraudAlertDB.timestamp)).limit(limit).all()
-        
-        alerts = []
-        for db_alert in db_alerts:
-            alert = FraudAlert(
-                id=db_alert.id,
-                transaction_id=db_alert.transaction_id,
-                account_number=db_alert.account_number,
-                alert_type=db_alert.alert_type,
-                severity=db_alert.severity,
-                message=db_alert.message,
-                fraud_score=db_alert.fraud_score,
-                risk_factors=parse_risk_factors(db_alert.risk_factors),
-                timestamp=db_alert.timestamp,
-                is_resolved=db_alert.is_resolved,
-                resolved_by=db_alert.resolved_by,
-                resolution_notes=db_alert.resolution_notes
-            )
-            alerts.append(alert)
-        
-        return alerts
+        with SessionLocal() as db:
+            rows = db.execute(
+                select(*_ALERT_COLUMNS)
+                .where(FraudAlertDB.is_resolved == False)
+                .order_by(desc(FraudAlertDB.timestamp))
+                .limit(limit)
+            ).all()
+        
+        return [_row_to_alert(row) for row in rows]
     
     def get_alerts_by_severity(self, severity: RiskLevel, limit: int = 50) -> List[FraudAlert]:
         """Get alerts by severity level."""
-        db = self.get_db_session()
-        
-        db_alerts = db.query(FraudAlertDB).filter(
-            FraudAlertDB.severity == severity.value,
-            FraudAlertDB.is_resolved == False
-        ).order_by(desc(FraudAlertDB.timestamp)).limit(limit).all()
-        
-        alerts = []
-        for db_alert in db_alerts:
-            alert = FraudAlert(
-                id=db_alert.id,
-                transaction_id=db_alert.transaction_id,
-                account_number=db_alert.account_number,
-                alert_type=db_alert.alert_type,
-                severity=db_alert.severity,
-                message=db_alert.message,
-                fraud_score=db_alert.fraud_score,
-                risk_factors=parse_risk_factors(db_alert.risk_factors),
-                timestamp=db_alert.timestamp,
-                is_resolved=db_alert.is_resolved,
-                resolved_by=db_alert.resolved_by,
-                resolution_notes=db_alert.resolution_notes
-            )
-            alerts.append(alert)
-        
-        return alerts
+        with SessionLocal() as db:
+            rows = db.execute(
+                select(*_ALERT_COLUMNS)
+                .where(
+                    FraudAlertDB.severity == _SEVERITY_CODES[severity],
+                    FraudAlertDB.is_resolved == False
+                )
+                .order_by(desc(FraudAlertDB.timestamp))
+                .limit(limit)
+            ).all()
+        
+        return [_row_to_alert(row) for row in rows]
     
     def resolve_alert(self, alert_id: int, resolved_by: str, resolution_notes: str = "") -> bool:
         """Resolve a fraud alert."""
-        db = self.get_db_session()
-        
         try:
-            db_alert = db.query(FraudAlertDB).filter(FraudAlertDB.id == alert_id).first()
-            
-            if not db_alert:
-                return False
+            with SessionLocal.begin() as db:
+                db_alert = db.query(FraudAlertDB).filter(FraudAlertDB.id == alert_id).first()
+                
+                if not db_alert:
+                    return False
+                
+                db_alert.is_resolved = True
+                db_alert.resolved_by = resolved_by
+                db_alert.resolution_notes = resolution_notes
             
-            db_alert.is_resolved = True
-            db_alert.resolved_by = resolved_by
-            db_alert.resolution_notes = resolution_notes
-            
-            db.commit()
             return True
             
         except Exception as e:
-            db.rollback()
             return False
     
     def get_alert_stats(self) -> Dict:
         """Get alert statistics."""
-        db = self.get_db_session()
-        
-        # Total alerts
-        total_alerts = db.query(FraudAlertDB).count()
-        
-        # Active alerts
-        active_alerts = db.query(FraudAlertDB).filter(
-            FraudAlertDB.is_resolved == False
-        ).count()
-        
-        # Critical alerts
-        critical_alerts = db.query(FraudAlertDB).filter(
-            FraudAlertDB.severity == RiskLevel.CRITICAL.value,
-            FraudAlertDB.is_resolved == False
-        ).count()
-        
-        # High-risk alerts
-        high_risk_alerts = db.query(FraudAlertDB).filter(
-            FraudAlertDB.severity == RiskLevel.HIGH.value,
-            FraudAlertDB.is_resolved == False
-        ).count()
-        
-        # Today's alerts
         today = datetime.utcnow().date()
-        today_alerts = db.query(FraudAlertDB).filter(
-            FraudAlertDB.timestamp >= today
-        ).count()
+        active = FraudAlertDB.is_resolved == False
+        
+        # All counters in one scan; COUNT ignores the NULLs from unmatched CASEs
+        with SessionLocal() as db:
+            stats = db.execute(select(
+                func.count().label("total_alerts"),
+                func.count(case((active, 1))).label("active_alerts"),
+                func.count(case((active & (FraudAlertDB.severity == _CRITICAL_CODE), 1))).label("critical_alerts"),
+                func.count(case((active & (FraudAlertDB.severity == _HIGH_CODE), 1))).label("high_risk_alerts"),
+                func.count(case((FraudAlertDB.timestamp >= today, 1))).label("today_alerts")
+            ).select_from(FraudAlertDB)).one()
+        total_alerts, active_alerts, critical_alerts, high_risk_alerts, today_alerts = stats
         
         return {
             'total_alerts': total_alerts,
@@ -189,43 +194,12 @@ class AlertService:
             'resolution_rate': ((total_alerts - active_alerts) / total_alerts * 100) if total_alerts > 0 else 0
         }
     
-    def _determine_alert_type(self, fraud_score: float) -> str:
-        """Determine alert type based on fraud score."""
-        if fraud_score >= 0.9:
-            return "CRITICAL_FRAUD"
-        elif fraud_score >= 0.7:
-            return "HIGH_RISK_TRANSACTION"
-        elif fraud_score >= 0.5:
-            return "SUSPICIOUS_ACTIVITY"
-        else:
-            return "ANOMALY_DETECTED"
-    
-    def _determine_severity(self, fraud_score: float) -> RiskLevel:
-        """Determine severity based on fraud score."""
-        if fraud_score >= 0.9:
-            return RiskLevel.CRITICAL
-        elif fraud_score >= 0.7:
-            return RiskLevel.HIGH
-        elif fraud_score >= 0.4:
-            return RiskLevel.MEDIUM
-        else:
-            return RiskLevel.LOW
-    
-    def _generate_alert_message(self, transaction: Transaction, fraud_score: float, risk_factors: List[str]) -> str:
+    def _generate_alert_message(self, transaction: Transaction, prefix: str, risk_factors: List[str]) -> str:
         """Generate alert message."""
-        from core.utils import format_currency, mask_account_number
-        
         masked_account = mask_account_number(transaction.account_number)
         formatted_amount = format_currency(transaction.amount)
         
-        if fraud_score >= 0.9:
-            message = f"🚨 CRITICAL FRAUD ALERT: {formatted_amount} transaction on account {masked_account}"
-        elif fraud_score >= 0.7:
-            message = f"⚠️ HIGH RISK: {formatted_amount} transaction on account {masked_account}"
-        elif fraud_score >= 0.5:
-            message = f"🔍 SUSPICIOUS: {formatted_amount} transaction on account {masked_account}"
-        else:
-            message = f"📊 ANOMALY: {formatted_amount} transaction on account {masked_account}"
+        message = f"{prefix}: {formatted_amount} transaction on account {masked_account}"
         
         if risk_factors:
             message += f" | Risk factors: {', '.join(risk_factors[:3])}"
@@ -2,27 +2,119 @@
 Machine Learning-based fraud detection service.
 """
 
+import os
+import threading
+from functools import lru_cache
+from operator import itemgetter
 import numpy as np
-import pandas as pd
 from datetime import datetime, timedelta
 from typing import List, Dict, Tuple, Optional
-from sklearn.ensemble import IsolationForest, RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-import joblib
-import os
+
+# scikit-learn, joblib and skl2onnx are imported inside the load/train paths,
+# so importing this module stays cheap until the fraud model is first used
+
+# Optional native inference (onnxruntime) for the exported Isolation Forest
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
 
 from models.schemas import Transaction, FraudScore, RiskLevel
 from core.utils import (
     calculate_time_risk, 
+    calculate_time_risk_vec,
     calculate_amount_risk, 
     get_location_risk,
-    is_business_hours,
-    is_weekend
+    ttl_cache
 )
 from core.security import is_suspicious_ip, calculate_velocity_risk
+from core.logging import app_logger
 from app.config import settings
 
+logger = app_logger.getChild(__name__)
+
+try:
+    from numba import njit, vectorize
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _patch_sklearn():
+    """Swap in Intel Extension for Scikit-learn estimators when it is installed."""
+    # Must run before any sklearn estimator is imported or unpickled
+    try:
+        from sklearnex import patch_sklearn
+        patch_sklearn(verbose=False)
+    except ImportError:
+        pass
+
+
+# Transaction type encoding for the transaction_type_encoded feature
+TYPE_MAPPING = {
+    'deposit': 0, 'withdrawal': 1, 'transfer': 2, 'bill_payment': 3,
+    'mobile_banking': 4, 'atm': 5, 'online': 6, 'cheque': 7
+}
+
+
+def _rule_score(amount, hour, is_business_hours, is_weekend, velocity_score,
+                amount_to_balance_ratio, location_risk):
+    """Rule-based fraud score for one transaction's numeric features."""
+    score = 0.0
+    
+    # High amount transactions
+    if amount > 500000:  # 5 lakh PKR
+        score += 0.3
+    elif amount > 100000:  # 1 lakh PKR
+        score += 0.1
+    
+    # Time-based rules
+    if not is_business_hours:
+        score += 0.2
+    
+    if is_weekend:
+        score += 0.1
+    
+    # Late night transactions (11 PM - 5 AM)
+    if hour >= 23 or hour <= 5:
+        score += 0.3
+    
+    # High velocity
+    if velocity_score > 0.5:
+        score += 0.4
+    
+    # High amount to balance ratio
+    if amount_to_balance_ratio > 0.8:
+        score += 0.4
+    elif amount_to_balance_ratio > 0.5:
+        score += 0.2
+    
+    # Location risk
+    score += location_risk * 0.3
+    
+    return min(score, 1.0)
+
+
+if NUMBA_AVAILABLE:
+    # Explicit signatures compile at import, so the first request pays no JIT cost;
+    # the ufunc variant applies the same kernel element-wise over a batch
+    _RULE_SIGNATURE = "f8(f8, f8, f8, f8, f8, f8, f8)"
+    _rule_based_scores = vectorize([_RULE_SIGNATURE], cache=True)(_rule_score)
+    _rule_score = njit(_RULE_SIGNATURE, cache=True)(_rule_score)
+else:
+    def _rule_based_scores(amount: np.ndarray, hour: np.ndarray, is_business_hours: np.ndarray,
+                           is_weekend: np.ndarray, velocity_score: np.ndarray,
+                           amount_to_balance_ratio: np.ndarray, location_risk: np.ndarray) -> np.ndarray:
+        """Vectorized _rule_score over feature columns."""
+        score = np.where(amount > 500000, 0.3, np.where(amount > 100000, 0.1, 0.0))
+        score += 0.2 * (is_business_hours == 0)
+        score += 0.1 * (is_weekend != 0)
+        score += 0.3 * ((hour >= 23) | (hour <= 5))
+        score += 0.4 * (velocity_score > 0.5)
+        score += np.where(amount_to_balance_ratio > 0.8, 0.4, np.where(amount_to_balance_ratio > 0.5, 0.2, 0.0))
+        score += location_risk * 0.3
+        return np.minimum(score, 1.0)
+
 
 class FraudDetectionService:
     """Advanced fraud detection using machine learning."""
@@ -30,34 +122,105 @@ class FraudDetectionService:
     def __init__(self):
         self.isolation_forest = None
         self.random_forest = None
-        self.scaler = StandardScaler()
+        self.scaler = None
         self.feature_columns = [
             'amount', 'hour', 'day_of_week', 'is_weekend', 'is_business_hours',
             'amount_to_balance_ratio', 'velocity_score', 'location_risk',
             'time_risk', 'transaction_type_encoded'
         ]
+        # Feature packing resolved once: a C-level getter in column order and a
+        # per-thread (1, n_features) buffer reused by calculate_fraud_score
+        self._get_feature_row = itemgetter(*self.feature_columns)
+        self._feature_buffers = threading.local()
+        # Fitted scaler as an affine transform applied in place: (X - mean) * inv_scale
+        self._scaler_ready = False
+        self._mean = None
+        self._inv_scale = None
         self.model_path = "models/fraud_model.joblib"
         self.scaler_path = "models/scaler.joblib"
+        self.onnx_path = "models/fraud_model.onnx"
+        self._ort_session = None
         
         # Load or initialize models
         self._load_or_initialize_models()
     
     def _load_or_initialize_models(self):
         """Load existing models or initialize new ones."""
+        _patch_sklearn()
         try:
             if os.path.exists(self.model_path) and os.path.exists(self.scaler_path):
+                import joblib
                 self.isolation_forest = joblib.load(self.model_path)
                 self.scaler = joblib.load(self.scaler_path)
-                print("✅ Fraud detection models loaded successfully")
+                self._set_scaling()
+                self._load_onnx_session()
+                logger.info("✅ Fraud detection models loaded successfully")
             else:
                 self._initialize_models()
-                print("🔄 Initialized new fraud detection models")
+                logger.info("🔄 Initialized new fraud detection models")
         except Exception as e:
-            print(f"⚠️ Error loading models: {e}")
+            logger.warning("⚠️ Error loading models: %s", e)
             self._initialize_models()
     
+    def _set_scaling(self):
+        """Cache the fitted scaler's mean and reciprocal scale for in-place scaling."""
+        self._mean = self.scaler.mean_
+        self._inv_scale = 1.0 / self.scaler.scale_
+        self._scaler_ready = True
+    
+    def _scale(self, X: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """Standardize X into out (which may be X itself) without temporaries."""
+        if not self._scaler_ready:
+            return X
+        np.subtract(X, self._mean, out=out)
+        np.multiply(out, self._inv_scale, out=out)
+        return out
+    
+    def _export_onnx(self):
+        """Export the trained Isolation Forest to ONNX, or drop a stale export."""
+        # Never leave an export of an older model next to the new one
+        if os.path.exists(self.onnx_path):
+            os.remove(self.onnx_path)
+        try:
+            from skl2onnx import convert_sklearn
+            from skl2onnx.common.data_types import FloatTensorType
+        except ImportError:
+            return
+        
+        try:
+            onnx_model = convert_sklearn(
+                self.isolation_forest,
+                initial_types=[("X", FloatTensorType([None, len(self.feature_columns)]))],
+                target_opset={"": 15, "ai.onnx.ml": 3}
+            )
+            with open(self.onnx_path, "wb") as f:
+                f.write(onnx_model.SerializeToString())
+        except Exception as e:
+            logger.warning("⚠️ Error exporting ONNX model, using scikit-learn: %s", e)
+    
+    def _load_onnx_session(self):
+        """Open an ONNX Runtime session for the exported model when available."""
+        self._ort_session = None
+        if onnxruntime is not None and os.path.exists(self.onnx_path):
+            try:
+                self._ort_session = onnxruntime.InferenceSession(
+                    self.onnx_path, providers=["CPUExecutionProvider"]
+                )
+            except Exception as e:
+                logger.warning("⚠️ Error loading ONNX model, using scikit-learn: %s", e)
+    
+    def _decision_function(self, X_scaled: np.ndarray) -> np.ndarray:
+        """Isolation Forest anomaly scores, via ONNX Runtime when a session is loaded."""
+        if self._ort_session is not None:
+            return self._ort_session.run(["scores"], {"X": X_scaled.astype(np.float32)})[0].ravel()
+        return self.isolation_forest.decision_function(X_scaled)
+    
     def _initialize_models(self):
         """Initialize new ML models with default parameters."""
+        from sklearn.ensemble import IsolationForest
+        from sklearn.preprocessing import StandardScaler
+        
+        self.scaler = StandardScaler()
         self.isolation_forest = IsolationForest(
             contamination=0.1,  # Expect 10% fraud
             random_state=42,
@@ -65,67 +228,83 @@ class FraudDetectionService:
         )
         
         # Create sample data for initial training
-        sample_data = self._generate_sample_data()
-        if len(sample_data) > 0:
-            self._train_models(sample_data)
+        X, _ = self._generate_sample_data()
+        if len(X) > 0:
+            self._train_models(X)
     
-    def _generate_sample_data(self) -> pd.DataFrame:
-        """Generate sample transaction data for initial model training."""
-        np.random.seed(42)
+    def _generate_sample_data(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Generate sample (features, labels) data for initial model training."""
+        rng = np.random.default_rng(42)
         n_samples = 1000
+        n_normal = int(n_samples * 0.9)  # 90% normal
+        n_fraud = int(n_samples * 0.1)  # 10% fraud
         
-        # Generate normal transactions
-        normal_transactions = []
-        for i in range(int(n_samples * 0.9)):  # 90% normal
-            transaction = {
-                'amount': np.random.lognormal(8, 1),  # Log-normal distribution for amounts
-                'hour': np.random.choice(range(9, 18), p=[0.1, 0.15, 0.15, 0.2, 0.2, 0.1, 0.05, 0.03, 0.02]),
-                'day_of_week': np.random.choice(range(7), p=[0.2, 0.2, 0.2, 0.2, 0.1, 0.05, 0.05]),
-                'is_weekend': 0,
-                'is_business_hours': 1,
-                'amount_to_balance_ratio': np.random.uniform(0.01, 0.3),
-                'velocity_score': np.random.uniform(0, 0.2),
-                'location_risk': np.random.uniform(0, 0.1),
-                'time_risk': np.random.uniform(0, 0.2),
-                'transaction_type_encoded': np.random.choice(range(8)),
-                'is_fraud': 0
-            }
-            normal_transactions.append(transaction)
+        # Normal transactions
+        normal = {
+            'amount': rng.lognormal(8, 1, n_normal),  # Log-normal distribution for amounts
+            'hour': rng.choice(np.arange(9, 18), n_normal, p=[0.1, 0.15, 0.15, 0.2, 0.2, 0.1, 0.05, 0.03, 0.02]),
+            'day_of_week': rng.choice(7, n_normal, p=[0.2, 0.2, 0.2, 0.2, 0.1, 0.05, 0.05]),
+            'is_weekend': np.zeros(n_normal),
+            'is_business_hours': np.ones(n_normal),
+            'amount_to_balance_ratio': rng.uniform(0.01, 0.3, n_normal),
+            'velocity_score': rng.uniform(0, 0.2, n_normal),
+            'location_risk': rng.uniform(0, 0.1, n_normal),
+            'time_risk': rng.uniform(0, 0.2, n_normal),
+            'transaction_type_encoded': rng.choice(8, n_normal)
+        }
         
-        # Generate fraudulent transactions
-        fraud_transactions = []
-        for i in range(int(n_samples * 0.1)):  # 10% fraud
-            transaction = {
-                'amount': np.random.lognormal(10, 1.5),  # Higher amounts
-                'hour': np.random.choice(range(24), p=[0.1]*6 + [0.02]*12 + [0.1]*6),  # More at night
-                'day_of_week': np.random.choice(range(7)),
-                'is_weekend': np.random.choice([0, 1], p=[0.3, 0.7]),  # More on weekends
-                'is_business_hours': np.random.choice([0, 1], p=[0.7, 0.3]),  # More outside business hours
-                'amount_to_balance_ratio': np.random.uniform(0.5, 1.0),  # Higher ratios
-                'velocity_score': np.random.uniform(0.3, 1.0),  # Higher velocity
-                'location_risk': np.random.uniform(0.2, 0.8),  # Higher location risk
-                'time_risk': np.random.uniform(0.3, 1.0),  # Higher time risk
-                'transaction_type_encoded': np.random.choice(range(8)),
-                'is_fraud': 1
-            }
-            fraud_transactions.append(transaction)
+        # Fraudulent transactions; night hours weighted 5x over daytime
+        night_weighted_hours = np.array([0.1] * 6 + [0.02] * 12 + [0.1] * 6)
+        fraud = {
+            'amount': rng.lognormal(10, 1.5, n_fraud),  # Higher amounts
+            'hour': rng.choice(24, n_fraud, p=night_weighted_hours / night_weighted_hours.sum()),  # More at night
+            'day_of_week': rng.choice(7, n_fraud),
+            'is_weekend': rng.choice(2, n_fraud, p=[0.3, 0.7]),  # More on weekends
+            'is_business_hours': rng.choice(2, n_fraud, p=[0.7, 0.3]),  # More outside business hours
+            'amount_to_balance_ratio': rng.uniform(0.5, 1.0, n_fraud),  # Higher ratios
+            'velocity_score': rng.uniform(0.3, 1.0, n_fraud),  # Higher velocity
+            'location_risk': rng.uniform(0.2, 0.8, n_fraud),  # Higher location risk
+            'time_risk': rng.uniform(0.3, 1.0, n_fraud),  # Higher time risk
+            'transaction_type_encoded': rng.choice(8, n_fraud)
+        }
         
-        all_transactions = normal_transactions + fraud_transactions
-        return pd.DataFrame(all_transactions)
+        X = np.empty((n_normal + n_fraud, len(self.feature_columns)))
+        for j, col in enumerate(self.feature_columns):
+            X[:n_normal, j] = normal[col]
+            X[n_normal:, j] = fraud[col]
+        y = np.concatenate([np.zeros(n_normal), np.ones(n_fraud)])
+        return X, y
+    
+    def _feature_buffer(self) -> np.ndarray:
+        """Return the calling thread's (1, n_features) feature buffer."""
+        buffer = getattr(self._feature_buffers, "row", None)
+        if buffer is None:
+            buffer = self._feature_buffers.row = np.empty((1, len(self.feature_columns)))
+        return buffer
+    
+    def _batch_buffer(self, n: int) -> np.ndarray:
+        """Return an (n, n_features) view of the calling thread's scaled-batch buffer."""
+        buffer = getattr(self._feature_buffers, "batch", None)
+        if buffer is None or buffer.shape[0] < n:
+            buffer = self._feature_buffers.batch = np.empty((n, len(self.feature_columns)))
+        return buffer[:n]
     
     def extract_features(self, transaction: Transaction, customer_data: Dict = None) -> Dict:
         """Extract features from transaction for ML model."""
         features = {}
         
-        # Basic transaction features
+        # Basic transaction features; timestamp attributes are read once
+        timestamp = transaction.timestamp
+        hour = timestamp.hour
+        day_of_week = timestamp.weekday()
         features['amount'] = transaction.amount
-        features['hour'] = transaction.timestamp.hour
-        features['day_of_week'] = transaction.timestamp.weekday()
-        features['is_weekend'] = int(is_weekend(transaction.timestamp))
-        features['is_business_hours'] = int(is_business_hours(transaction.timestamp))
+        features['hour'] = hour
+        features['day_of_week'] = day_of_week
+        features['is_weekend'] = int(day_of_week == 4 or day_of_week == 5)  # Friday, Saturday
+        features['is_business_hours'] = int(settings.business_hours_start <= hour < settings.business_hours_end)
         
         # Risk-based features
-        features['time_risk'] = calculate_time_risk(transaction.timestamp)
+        features['time_risk'] = calculate_time_risk(timestamp)
         features['location_risk'] = get_location_risk(transaction.location or "")
         
         # Customer-specific features
@@ -143,31 +322,114 @@ class FraudDetectionService:
             features['velocity_score'] = 0.0
         
         # Encode transaction type
-        type_mapping = {
-            'deposit': 0, 'withdrawal': 1, 'transfer': 2, 'bill_payment': 3,
-            'mobile_banking': 4, 'atm': 5, 'online': 6, 'cheque': 7
-        }
-        features['transaction_type_encoded'] = type_mapping.get(transaction.transaction_type, 0)
+        features['transaction_type_encoded'] = TYPE_MAPPING.get(transaction.transaction_type, 0)
         
         return features
     
+    def extract_features_batch(self, transactions: List[Transaction],
+                               customer_data_map: Dict[str, Dict] = None,
+                               customer_data_list: List[Optional[Dict]] = None) -> np.ndarray:
+        """Extract an (n_transactions, n_features) matrix in feature_columns order.
+        
+        Customer data is looked up by account number in ``customer_data_map``,
+        unless ``customer_data_list`` gives it per transaction, in order.
+        """
+        if customer_data_list is None:
+            customer_data_map = customer_data_map or {}
+            customer_data_list = [customer_data_map.get(t.account_number) for t in transactions]
+        n = len(transactions)
+        
+        amount = np.fromiter((t.amount for t in transactions), dtype=np.float64, count=n)
+        timestamps = np.array([t.timestamp for t in transactions], dtype="datetime64[us]")
+        days = timestamps.astype("datetime64[D]")
+        hour = (timestamps - days).astype("timedelta64[h]").astype(np.int64)
+        day_of_week = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+        
+        # Customer-specific features; defaults when no customer data is known
+        amount_to_balance_ratio = np.full(n, 0.5)
+        velocity_score = np.zeros(n)
+        for i, (transaction, customer_data) in enumerate(zip(transactions, customer_data_list)):
+            if customer_data:
+                account_balance = customer_data.get('account_balance', 0)
+                amount_to_balance_ratio[i] = (
+                    transaction.amount / account_balance if account_balance > 0 else 1.0
+                )
+                velocity_score[i] = calculate_velocity_risk(customer_data.get('recent_transactions', []))
+        
+        columns = {
+            'amount': amount,
+            'hour': hour,
+            'day_of_week': day_of_week,
+            'is_weekend': (day_of_week == 4) | (day_of_week == 5),
+            'is_business_hours': (hour >= settings.business_hours_start) & (hour < settings.business_hours_end),
+            'amount_to_balance_ratio': amount_to_balance_ratio,
+            'velocity_score': velocity_score,
+            'location_risk': np.fromiter(
+                (get_location_risk(t.location or "") for t in transactions), dtype=np.float64, count=n
+            ),
+            'time_risk': calculate_time_risk_vec(timestamps),
+            'transaction_type_encoded': np.fromiter(
+                (TYPE_MAPPING.get(t.transaction_type, 0) for t in transactions), dtype=np.float64, count=n
+            )
+        }
+        
+        X = np.empty((n, len(self.feature_columns)))
+        for j, col in enumerate(self.feature_columns):
+            X[:, j] = columns[col]
+        return X
+    
+    def calculate_fraud_scores_batch(self, transactions: List[Transaction],
+                                     customer_data_map: Dict[str, Dict] = None,
+                                     customer_data_list: List[Optional[Dict]] = None) -> List[FraudScore]:
+        """Score many transactions with one scaler/model call; customer data as for extract_features_batch."""
+        if not transactions:
+            return []
+        
+        X = self.extract_features_batch(transactions, customer_data_map, customer_data_list)
+        
+        # Anomaly scores for the whole batch, converted to probabilities; X keeps
+        # the raw features for the rules, so scaling goes to a reused buffer
+        anomaly_scores = self._decision_function(self._scale(X, self._batch_buffer(len(X))))
+        fraud_probability = np.clip((1 - anomaly_scores) / 2, 0, 1)
+        
+        col = {name: X[:, j] for j, name in enumerate(self.feature_columns)}
+        rule_based_scores = _rule_based_scores(
+            col['amount'], col['hour'], col['is_business_hours'], col['is_weekend'],
+            col['velocity_score'], col['amount_to_balance_ratio'], col['location_risk']
+        )
+        final_scores = np.clip(fraud_probability * 0.7 + rule_based_scores * 0.3, 0, 1)
+        
+        timestamp = datetime.utcnow()
+        results = []
+        for i, transaction in enumerate(transactions):
+            final_score = float(final_scores[i])
+            features = {name: X[i, j] for j, name in enumerate(self.feature_columns)}
+            results.append(FraudScore(
+                transaction_id=transaction.transaction_id,
+                fraud_score=final_score,
+                risk_level=self._determine_risk_level(final_score),
+                risk_factors=self._identify_risk_factors(features, final_score),
+                confidence=0.85,  # Model confidence
+                model_version="1.0",
+                timestamp=timestamp
+            ))
+        return results
+    
     def calculate_fraud_score(self, transaction: Transaction, customer_data: Dict = None) -> FraudScore:
         """Calculate fraud score for a transaction."""
         try:
             # Extract features
             features = self.extract_features(transaction, customer_data)
             
-            # Prepare feature vector
-            feature_vector = np.array([[features[col] for col in self.feature_columns]])
+            # Prepare feature vector in this thread's reusable buffer
+            feature_vector = self._feature_buffer()
+            feature_vector[0] = self._get_feature_row(features)
             
-            # Scale features
-            if hasattr(self.scaler, 'transform'):
-                feature_vector_scaled = self.scaler.transform(feature_vector)
-            else:
-                feature_vector_scaled = feature_vector
+            # Scale features in place; the features dict keeps the raw values
+            feature_vector_scaled = self._scale(feature_vector, feature_vector)
             
             # Get anomaly score from Isolation Forest
-            anomaly_score = self.isolation_forest.decision_function(feature_vector_scaled)[0]
+            anomaly_score = self._decision_function(feature_vector_scaled)[0]
             
             # Convert to probability (0-1 scale)
             fraud_probability = max(0, min(1, (1 - anomaly_score) / 2))
@@ -195,8 +457,8 @@ class FraudDetectionService:
                 timestamp=datetime.utcnow()
             )
             
-        except Exception as e:
-            print(f"Error calculating fraud score: {e}")
+        except Exception:
+            logger.exception("Error calculating fraud score for %s", transaction.transaction_id)
             # Return conservative high-risk score on error
             return FraudScore(
                 transaction_id=transaction.transaction_id,
@@ -210,39 +472,12 @@ class FraudDetectionService:
     
     def _calculate_rule_based_score(self, features: Dict) -> float:
         """Calculate rule-based fraud score."""
-        score = 0.0
-        
-        # High amount transactions
-        if features['amount'] > 500000:  # 5 lakh PKR
-            score += 0.3
-        elif features['amount'] > 100000:  # 1 lakh PKR
-            score += 0.1
-        
-        # Time-based rules
-        if not features['is_business_hours']:
-            score += 0.2
-        
-        if features['is_weekend']:
-            score += 0.1
-        
-        # Late night transactions (11 PM - 5 AM)
-        if features['hour'] >= 23 or features['hour'] <= 5:
-            score += 0.3
-        
-        # High velocity
-        if features['velocity_score'] > 0.5:
-            score += 0.4
-        
-        # High amount to balance ratio
-        if features['amount_to_balance_ratio'] > 0.8:
-            score += 0.4
-        elif features['amount_to_balance_ratio'] > 0.5:
-            score += 0.2
-        
-        # Location risk
-        score += features['location_risk'] * 0.3
-        
-        return min(score, 1.0)
+        return _rule_score(
+            float(features['amount']), float(features['hour']),
+            float(features['is_business_hours']), float(features['is_weekend']),
+            float(features['velocity_score']), float(features['amount_to_balance_ratio']),
+            float(features['location_risk'])
+        )
     
     def _determine_risk_level(self, fraud_score: float) -> RiskLevel:
         """Determine risk level based on fraud score."""
@@ -289,28 +524,29 @@ class FraudDetectionService:
         
         return risk_factors
     
-    def _train_models(self, data: pd.DataFrame):
-        """Train the fraud detection models."""
+    def _train_models(self, X: np.ndarray):
+        """Train the fraud detection models on a feature_columns-ordered matrix."""
         try:
-            # Prepare features
-            X = data[self.feature_columns]
-            
             # Fit scaler
             self.scaler.fit(X)
+            self._set_scaling()
             X_scaled = self.scaler.transform(X)
             
             # Train Isolation Forest (unsupervised)
             self.isolation_forest.fit(X_scaled)
             
             # Save models
+            import joblib
             os.makedirs("models", exist_ok=True)
             joblib.dump(self.isolation_forest, self.model_path)
             joblib.dump(self.scaler, self.scaler_path)
+            self._export_onnx()
+            self._load_onnx_session()
             
-            print("✅ Fraud detection models trained and saved")
+            logger.info("✅ Fraud detection models trained and saved")
             
-        except Exception as e:
-            print(f"❌ Error training models: {e}")
+        except Exception:
+            logger.exception("❌ Error training models")
     
     def retrain_models(self, transactions: List[Transaction], labels: List[int] = None):
         """Retrain models with new transaction data."""
@@ -318,26 +554,20 @@ class FraudDetectionService:
             return
         
         try:
-            # Convert transactions to DataFrame
-            data_rows = []
-            for transaction in transactions:
-                features = self.extract_features(transaction)
-                features['is_fraud'] = 0  # Default to non-fraud
-                data_rows.append(features)
-            
-            if labels:
-                for i, label in enumerate(labels):
-                    if i < len(data_rows):
-                        data_rows[i]['is_fraud'] = label
-            
-            df = pd.DataFrame(data_rows)
+            # Feature matrix in feature_columns order; labels are not used by the
+            # unsupervised Isolation Forest
+            X = np.array([
+                self._get_feature_row(self.extract_features(transaction))
+                for transaction in transactions
+            ], dtype=np.float64)
             
             # Retrain models
-            self._train_models(df)
+            self._train_models(X)
             
-        except Exception as e:
-            print(f"❌ Error retraining models: {e}")
+        except Exception:
+            logger.exception("❌ Error retraining models")
     
+    @ttl_cache(60)
     def get_model_stats(self) -> Dict:
         """Get model statistics and performance metrics."""
         return {
@@ -351,5 +581,7 @@ class FraudDetectionService:
         }
 
 
-# Global fraud detection service instance
-fraud_detector = FraudDetectionService()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_fraud_detector() -> FraudDetectionService:
+    """Return the shared fraud detection service, loading its models on first use."""
+    return FraudDetectionService()
\ No newline at end of file
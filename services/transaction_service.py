@@ -2,229 +2,406 @@
 Transaction processing and management service.
 """
 
+import queue
+import threading
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from time import monotonic
+from typing import List, Dict, Optional, Tuple
+from sqlalchemy import case, desc, func, insert, select, update
+from pydantic import TypeAdapter
 
-from models.schemas import Transaction, TransactionCreate, Customer
-from core.database import TransactionDB, CustomerDB, get_db
-from core.utils import generate_transaction_id
-from services.fraud_detection import fraud_detector
+from models.schemas import Transaction, TransactionCreate, Customer, FraudScore, FraudAlert, RiskLevel
+from core.database import TransactionDB, CustomerDB, SessionLocal, risk_code, RISK_LEVELS
+from core.utils import generate_transaction_id, ttl_cache
+from core.logging import app_logger
+from services.fraud_detection import get_fraud_detector
+from services.alert_service import alert_service
+
+
+# Columns read back into Transaction models; risk level codes are mapped to
+# their names in SQL so rows validate directly
+_TRANSACTION_COLUMNS = (
+    TransactionDB.id,
+    TransactionDB.transaction_id,
+    TransactionDB.account_number,
+    TransactionDB.transaction_type,
+    TransactionDB.amount,
+    TransactionDB.timestamp,
+    TransactionDB.location,
+    TransactionDB.device_info,
+    TransactionDB.ip_address,
+    TransactionDB.merchant_name,
+    TransactionDB.description,
+    func.coalesce(TransactionDB.fraud_score, 0.0).label("fraud_score"),
+    case(dict(enumerate(RISK_LEVELS)), value=TransactionDB.risk_level).label("risk_level"),
+    TransactionDB.is_flagged
+)
+
+logger = app_logger.getChild(__name__)
+
+# Validates a whole result set in one pydantic-core call
+_TRANSACTION_LIST = TypeAdapter(List[Transaction])
+
+# Deferred transactions are scored in batches of up to _SCORING_BATCH_MAX,
+# waiting at most _SCORING_BATCH_WINDOW seconds for more after the first
+_SCORING_BATCH_MAX = 256
+_SCORING_BATCH_WINDOW = 0.05
+
+# Saved but not yet scored by the background worker
+_PENDING_SCORE = TransactionDB.fraud_score.is_(None)
 
 
 class TransactionService:
     """Service for managing transactions and customer data."""
     
     def __init__(self):
-        self.db_session = None
+        # Write-behind scoring for create_transaction_deferred, started on first use
+        self._scoring_queue: "queue.Queue[int]" = queue.Queue()
+        self._scoring_thread: Optional[threading.Thread] = None
+        self._scoring_lock = threading.Lock()
+    
+    def _new_transaction(self, transaction_data: TransactionCreate) -> Transaction:
+        """Create an unscored Transaction for incoming transaction data."""
+        return Transaction(
+            transaction_id=transaction_data.transaction_id or generate_transaction_id(),
+            account_number=transaction_data.account_number,
+            transaction_type=transaction_data.transaction_type,
+            amount=transaction_data.amount,
+            timestamp=datetime.utcnow(),
+            location=transaction_data.location,
+            device_info=transaction_data.device_info,
+            ip_address=transaction_data.ip_address,
+            merchant_name=transaction_data.merchant_name,
+            description=transaction_data.description
+        )
     
-    def get_db_session(self) -> Session:
-        """Get database session."""
-        if not self.db_session:
-            self.db_session = next(get_db())
-        return self.db_session
+    def _apply_score(self, transaction: Transaction, fraud_score: FraudScore) -> Dict:
+        """Record a fraud score on a transaction and return its database column values."""
+        transaction.fraud_score = fraud_score.fraud_score
+        transaction.risk_level = fraud_score.risk_level
+        transaction.is_flagged = fraud_score.fraud_score >= 0.7
+        return self._transaction_row(transaction)
+    
+    def _transaction_row(self, transaction: Transaction) -> Dict:
+        """Database column values for a transaction."""
+        return {
+            'transaction_id': transaction.transaction_id,
+            'account_number': transaction.account_number,
+            'transaction_type': transaction.transaction_type.value,
+            'amount': transaction.amount,
+            'timestamp': transaction.timestamp,
+            'location': transaction.location,
+            'device_info': transaction.device_info,
+            'ip_address': transaction.ip_address,
+            'merchant_name': transaction.merchant_name,
+            'description': transaction.description,
+            'fraud_score': transaction.fraud_score,
+            'risk_level': risk_code(transaction.risk_level),
+            'is_flagged': transaction.is_flagged
+        }
+    
+    def _build_transaction(self, transaction_data: TransactionCreate) -> Tuple[Transaction, FraudScore, TransactionDB]:
+        """Score a new transaction and build its database row without saving it."""
+        # Get customer data for fraud detection
+        customer_data = self.get_customer_data(transaction_data.account_number)
+        
+        # Create and score the transaction object
+        transaction = self._new_transaction(transaction_data)
+        fraud_score = get_fraud_detector().calculate_fraud_score(transaction, customer_data)
+        db_transaction = TransactionDB(**self._apply_score(transaction, fraud_score))
+        
+        return transaction, fraud_score, db_transaction
     
     def create_transaction(self, transaction_data: TransactionCreate) -> Transaction:
         """Create a new transaction with fraud detection."""
-        db = self.get_db_session()
+        transaction, _, db_transaction = self._build_transaction(transaction_data)
         
-        try:
-            # Get customer data for fraud detection
-            customer_data = self.get_customer_data(transaction_data.account_number)
-            
-            # Create transaction object
-            transaction = Transaction(
-                transaction_id=transaction_data.transaction_id or generate_transaction_id(),
-                account_number=transaction_data.account_number,
-                transaction_type=transaction_data.transaction_type,
-                amount=transaction_data.amount,
-                timestamp=datetime.utcnow(),
-                location=transaction_data.location,
-                device_info=transaction_data.device_info,
-                ip_address=transaction_data.ip_address,
-                merchant_name=transaction_data.merchant_name,
-                description=transaction_data.description
-            )
+        # Save to database; the flush reads the new id back from the INSERT itself
+        with SessionLocal.begin() as db:
+            db.add(db_transaction)
+            db.flush()
+            transaction.id = db_transaction.id
+        
+        self.get_customer_data.cache_invalidate(self, transaction.account_number)
+        return transaction
+    
+    def _with_batch_history(self, transactions: List[Transaction],
+                            customer_data_map: Dict[str, Dict]) -> List[Dict]:
+        """Per-transaction customer data that also counts earlier same-account batch items.
+        
+        Matches what create_transaction would see if the batch were sent one by one,
+        so a burst from one account still raises velocity.
+        """
+        earlier: Dict[str, List[Transaction]] = {}
+        customer_data_list = []
+        for transaction in transactions:
+            customer_data = customer_data_map.get(transaction.account_number)
+            previous = earlier.setdefault(transaction.account_number, [])
+            if customer_data and previous:
+                customer_data = dict(
+                    customer_data, recent_transactions=list(customer_data['recent_transactions']) + previous
+                )
+            customer_data_list.append(customer_data)
+            previous.append(transaction)
+        return customer_data_list
+    
+    def create_transactions_bulk(self, items: List[TransactionCreate]) -> List[Transaction]:
+        """Create many transactions with one batch fraud-scoring call and one commit.
+        
+        Each item's velocity includes the earlier items in the batch for the same
+        account, as if they had been created one at a time.
+        """
+        if not items:
+            return []
+        
+        transactions = [self._new_transaction(item) for item in items]
+        account_numbers = {t.account_number for t in transactions}
+        customer_data_map = {number: self.get_customer_data(number) for number in account_numbers}
+        
+        fraud_scores = get_fraud_detector().calculate_fraud_scores_batch(
+            transactions, customer_data_list=self._with_batch_history(transactions, customer_data_map)
+        )
+        rows = [self._apply_score(t, score) for t, score in zip(transactions, fraud_scores)]
+        
+        # Executemany INSERT ... RETURNING, with ids returned in row order
+        with SessionLocal.begin() as db:
+            ids = db.scalars(
+                insert(TransactionDB).returning(TransactionDB.id, sort_by_parameter_order=True),
+                rows
+            ).all()
+        
+        for transaction, transaction_id in zip(transactions, ids):
+            transaction.id = transaction_id
+        for account_number in account_numbers:
+            self.get_customer_data.cache_invalidate(self, account_number)
+        
+        return transactions
+    
+    def create_transaction_deferred(self, transaction_data: TransactionCreate) -> Transaction:
+        """Save a transaction unscored and queue it for background fraud scoring.
+        
+        The returned transaction carries the provisional defaults (low risk, not
+        flagged); the worker writes the real score back shortly afterwards.
+        """
+        transaction = self._new_transaction(transaction_data)
+        row = self._transaction_row(transaction)
+        row['fraud_score'] = None  # Pending until the worker scores it
+        
+        # Core INSERT, so the explicit NULL is kept rather than the column default
+        with SessionLocal.begin() as db:
+            transaction.id = db.scalar(insert(TransactionDB).values(row).returning(TransactionDB.id))
+        
+        self.get_customer_data.cache_invalidate(self, transaction.account_number)
+        self._start_scoring_worker()
+        self._scoring_queue.put(transaction.id)
+        return transaction
+    
+    def _start_scoring_worker(self) -> None:
+        """Start the background scoring thread if it is not already running."""
+        with self._scoring_lock:
+            if self._scoring_thread is None:
+                self._scoring_thread = threading.Thread(
+                    target=self._scoring_loop, name="transaction-scoring", daemon=True
+                )
+                self._scoring_thread.start()
+    
+    def _scoring_loop(self) -> None:
+        """Drain queued transaction ids and score each batch with score_pending_transactions."""
+        # Pick up rows left pending by a previous process first
+        with SessionLocal() as db:
+            for transaction_id in db.scalars(select(TransactionDB.id).where(_PENDING_SCORE)):
+                self._scoring_queue.put(transaction_id)
+        
+        while True:
+            batch = [self._scoring_queue.get()]
+            deadline = monotonic() + _SCORING_BATCH_WINDOW
+            while len(batch) < _SCORING_BATCH_MAX:
+                timeout = deadline - monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._scoring_queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
             
-            # Calculate fraud score
-            fraud_score = fraud_detector.calculate_fraud_score(transaction, customer_data)
-            transaction.fraud_score = fraud_score.fraud_score
-            transaction.risk_level = fraud_score.risk_level
-            transaction.is_flagged = fraud_score.fraud_score >= 0.7
+            try:
+                self.score_pending_transactions(batch)
+            except Exception:
+                logger.exception("Error scoring %d pending transactions", len(batch))
+    
+    def _customer_data_before(self, customer_data: Dict, transaction: Transaction) -> Dict:
+        """Customer data as create_transaction would have seen it for an already saved transaction."""
+        # The saved row and any later ones are already in recent_transactions;
+        # keep only those created before it (earlier pending rows included)
+        if not customer_data:
+            return customer_data
+        return dict(customer_data, recent_transactions=[
+            row for row in customer_data['recent_transactions'] if row.timestamp < transaction.timestamp
+        ])
+    
+    def score_pending_transactions(self, ids: List[int]) -> List[Transaction]:
+        """Score the given transactions that are still pending and write the results back."""
+        with SessionLocal() as db:
+            rows = db.execute(
+                select(*_TRANSACTION_COLUMNS).where(TransactionDB.id.in_(ids), _PENDING_SCORE)
+            ).all()
+        
+        transactions = _TRANSACTION_LIST.validate_python(rows, from_attributes=True)
+        if not transactions:
+            return []
+        
+        customer_data_map = {
+            number: self.get_customer_data(number)
+            for number in {t.account_number for t in transactions}
+        }
+        fraud_scores = get_fraud_detector().calculate_fraud_scores_batch(transactions, customer_data_list=[
+            self._customer_data_before(customer_data_map[t.account_number], t) for t in transactions
+        ])
+        
+        scores = dict(zip((t.id for t in transactions), fraud_scores))
+        db_rows = {t.id: self._apply_score(t, scores[t.id]) for t in transactions}
+        
+        def by_id(column):
+            return case({i: row[column] for i, row in db_rows.items()}, value=TransactionDB.id)
+        
+        # One UPDATE for the whole batch that only touches rows still pending, so
+        # when two callers score the same ids each row is written and alerted once
+        with SessionLocal.begin() as db:
+            claimed = set(db.scalars(
+                update(TransactionDB)
+                .where(TransactionDB.id.in_(list(db_rows)), _PENDING_SCORE)
+                .values(
+                    fraud_score=by_id('fraud_score'),
+                    risk_level=by_id('risk_level'),
+                    is_flagged=by_id('is_flagged')
+                )
+                .returning(TransactionDB.id)
+                .execution_options(synchronize_session=False)
+            ))
+            transactions = [t for t in transactions if t.id in claimed]
             
-            # Save to database
-            db_transaction = TransactionDB(
-                transaction_id=transaction.transaction_id,
-                account_number=transaction.account_number,
-                transaction_type=transaction.transaction_type.value,
-                amount=transaction.amount,
-                timestamp=transaction.timestamp,
-                location=transaction.location,
-                device_info=transaction.device_info,
-                ip_address=transaction.ip_address,
-                merchant_name=transaction.merchant_name,
-                description=transaction.description,
-                fraud_score=transaction.fraud_score,
-                risk_level=transaction.risk_level.value,
-                is_flagged=transaction.is_flagged
+            alerts = [
+                alert_service.build_alert(t, scores[t.id].fraud_score, scores[t.id].risk_factors)
+                for t in transactions if t.is_flagged
+            ]
+            db.add_all([db_alert for _, db_alert in alerts])
+            db.flush()
+            for alert, db_alert in alerts:
+                alert.id = db_alert.id
+        
+        return transactions
+    
+    def create_transaction_with_alert(self, transaction_data: TransactionCreate) -> Tuple[Transaction, Optional[FraudAlert]]:
+        """Create a transaction and, if it is flagged, its fraud alert in a single commit."""
+        transaction, fraud_score, db_transaction = self._build_transaction(transaction_data)
+        
+        # Reuse the score computed above rather than re-scoring for the alert
+        alert = None
+        if transaction.is_flagged:
+            alert, db_alert = alert_service.build_alert(
+                transaction, fraud_score.fraud_score, fraud_score.risk_factors
             )
-            
+        
+        # Flush to assign IDs; both rows commit together when the block exits
+        with SessionLocal.begin() as db:
             db.add(db_transaction)
-            db.commit()
-            db.refresh(db_transaction)
-            
-            return transaction
-            
-        except Exception as e:
-            db.rollback()
-            raise e
+            if alert is not None:
+                db.add(db_alert)
+            db.flush()
+            transaction.id = db_transaction.id
+            if alert is not None:
+                alert.id = db_alert.id
+        
+        self.get_customer_data.cache_invalidate(self, transaction.account_number)
+        return transaction, alert
     
     def get_transaction(self, transaction_id: str) -> Optional[Transaction]:
         """Get transaction by ID."""
-        db = self.get_db_session()
+        with SessionLocal() as db:
+            row = db.execute(
+                select(*_TRANSACTION_COLUMNS).where(TransactionDB.transaction_id == transaction_id)
+            ).first()
         
-        db_transaction = db.query(TransactionDB).filter(
-            TransactionDB.transaction_id == transaction_id
-        ).first()
-        
-        if not db_transaction:
+        if not row:
             return None
         
-        return Transaction(
-            id=db_transaction.id,
-            transaction_id=db_transaction.transaction_id,
-            account_number=db_transaction.account_number,
-            transaction_type=db_transaction.transaction_type,
-            amount=db_transaction.amount,
-            timestamp=db_transaction.timestamp,
-            location=db_transaction.location,
-            device_info=db_transaction.device_info,
-            ip_address=db_transaction.ip_address,
-            merchant_name=db_transaction.merchant_name,
-            description=db_transaction.description,
-            fraud_score=db_transaction.fraud_score,
-            risk_level=db_transaction.risk_level,
-            is_flagged=db_transaction.is_flagged
-        )
+        return Transaction.model_validate(row, from_attributes=True)
     
     def get_transactions_by_account(self, account_number: str, limit: int = 100) -> List[Transaction]:
         """Get transactions for an account."""
-        db = self.get_db_session()
-        
-        db_transactions = db.query(TransactionDB).filter(
-            TransactionDB.account_number == account_number
-        ).order_by(desc(TransactionDB.timestamp)).limit(limit).all()
-        
-        transactions = []
-        for db_transaction in db_transactions:
-            transaction = Transaction(
-                id=db_transaction.id,
-                transaction_id=db_transaction.transaction_id,
-                account_number=db_transaction.account_number,
-                transaction_type=db_transaction.transaction_type,
-                amount=db_transaction.amount,
-                timestamp=db_transaction.timestamp,
-                location=db_transaction.location,
-                device_info=db_transaction.device_info,
-                ip_address=db_transaction.ip_address,
-                merchant_name=db_transaction.merchant_name,
-                description=db_transaction.description,
-                fraud_score=db_transaction.fraud_score,
-                risk_level=db_transaction.risk_level,
-                is_flagged=db_transaction.is_flagged
-            )
-            transactions.append(transaction)
+        with SessionLocal() as db:
+            rows = db.execute(
+                select(*_TRANSACTION_COLUMNS)
+                .where(TransactionDB.account_number == account_number)
+                .order_by(desc(TransactionDB.timestamp))
+                .limit(limit)
+            ).all()
         
-        return transactions
+        return _TRANSACTION_LIST.validate_python(rows, from_attributes=True)
     
     def get_flagged_transactions(self, limit: int = 50) -> List[Transaction]:
         """Get flagged transactions for review."""
-        db = self.get_db_session()
-        
-        db_transactions = db.query(TransactionDB).filter(
-            TransactionDB.is_flagged == True
-        ).order_by(desc(TransactionDB.timestamp)).limit(limit).all()
-        
-        transactions = []
-        for db_transaction in db_transactions:
-            transaction = Transaction(
-                id=db_transaction.id,
-                transaction_id=db_transaction.transaction_id,
-                account_number=db_transaction.account_number,
-                transaction_type=db_transaction.transaction_type,
-                amount=db_transaction.amount,
-                timestamp=db_transaction.timestamp,
-                location=db_transaction.location,
-                device_info=db_transaction.device_info,
-                ip_address=db_transaction.ip_address,
-                merchant_name=db_transaction.merchant_name,
-                description=db_transaction.description,
-                fraud_score=db_transaction.fraud_score,
-                risk_level=db_transaction.risk_level,
-                is_flagged=db_transaction.is_flagged
-            )
-            transactions.append(transaction)
+        with SessionLocal() as db:
+            rows = db.execute(
+                select(*_TRANSACTION_COLUMNS)
+                .where(TransactionDB.is_flagged == True)
+                .order_by(desc(TransactionDB.timestamp))
+                .limit(limit)
+            ).all()
         
-        return transactions
+        return _TRANSACTION_LIST.validate_python(rows, from_attributes=True)
     
+    @ttl_cache(30, maxsize=10_000)
     def get_customer_data(self, account_number: str) -> Dict:
         """Get customer data for fraud detection."""
-        db = self.get_db_session()
-        
-        # Get customer info
-        customer = db.query(CustomerDB).filter(
-            CustomerDB.account_number == account_number
-        ).first()
-        
-        if not customer:
-            return {}
-        
-        # Get recent transactions
-        recent_transactions = db.query(TransactionDB).filter(
+        now = datetime.utcnow()
+        recent = (
             TransactionDB.account_number == account_number,
-            TransactionDB.timestamp >= datetime.utcnow() - timedelta(days=30)
-        ).all()
+            TransactionDB.timestamp >= now - timedelta(days=30)
+        )
         
-        # Calculate average transaction amount
-        if recent_transactions:
-            avg_amount = sum(t.amount for t in recent_transactions) / len(recent_transactions)
-        else:
-            avg_amount = 0
+        with SessionLocal() as db:
+            # Customer info and the 30-day average amount in one round-trip
+            customer = db.query(
+                CustomerDB.account_balance,
+                CustomerDB.risk_score,
+                CustomerDB.account_created,
+                select(func.avg(TransactionDB.amount)).where(*recent).scalar_subquery().label("avg_amount")
+            ).filter(
+                CustomerDB.account_number == account_number
+            ).first()
+            
+            if not customer:
+                return {}
+            
+            # Recent transactions, only the columns velocity scoring reads
+            recent_transactions = db.query(TransactionDB.timestamp, TransactionDB.amount).filter(*recent).all()
         
         return {
             'account_balance': customer.account_balance,
-            'avg_transaction_amount': avg_amount,
+            'avg_transaction_amount': customer.avg_amount or 0,
             'recent_transactions': recent_transactions,
             'customer_risk_score': customer.risk_score,
-            'account_age_days': (datetime.utcnow() - customer.account_created).days
+            'account_age_days': (now - customer.account_created).days
         }
     
     def get_transaction_stats(self) -> Dict:
         """Get transaction statistics."""
-        db = self.get_db_session()
-        
-        # Total transactions
-        total_transactions = db.query(TransactionDB).count()
-        
-        # Flagged transactions
-        flagged_transactions = db.query(TransactionDB).filter(
-            TransactionDB.is_flagged == True
-        ).count()
-        
-        # Today's transactions
-        today = datetime.utcnow().date()
-        today_transactions = db.query(TransactionDB).filter(
-            func.date(TransactionDB.timestamp) == today
-        ).count()
-        
-        # High-risk transactions
-        high_risk_transactions = db.query(TransactionDB).filter(
-            TransactionDB.fraud_score >= 0.7
-        ).count()
+        # Today's range as timestamp bounds, so the index on timestamp applies
+        today = datetime.combine(datetime.utcnow().date(), datetime.min.time())
+        tomorrow = today + timedelta(days=1)
         
-        # Total transaction volume
-        total_volume = db.query(func.sum(TransactionDB.amount)).scalar() or 0
+        # All statistics in one scan; COUNT ignores the NULLs from unmatched CASEs
+        with SessionLocal() as db:
+            stats = db.execute(select(
+                func.count(),
+                func.count(case((TransactionDB.is_flagged == True, 1))),
+                func.count(case(((TransactionDB.timestamp >= today) & (TransactionDB.timestamp < tomorrow), 1))),
+                func.count(case((TransactionDB.fraud_score >= 0.7, 1))),
+                func.sum(TransactionDB.amount)
+            )).one()
+        total_transactions, flagged_transactions, today_transactions, high_risk_transactions, total_volume = stats
+        total_volume = total_volume or 0
         
         return {
             'total_transactions': total_transactions,